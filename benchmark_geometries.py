@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Benchmark des encodages de géométrie (?geom=) sur l'ensemble des gares et des axes
+
+Pour chaque couche et chaque encodage (wkt, geojson, polyline, binary pour les points) :
+  1. la taille envoyée : brute, gzip et brotli (si installé)
+  2. le temps de lecture côté client : JSON.parse + décodage des géométries en coordonnées,
+     mesuré dans Node.js s'il est installé (même moteur que le navigateur), sinon en Python
+Les lignes binary (positions seules) se comparent à wkt une fois ajoutée la ligne none (attributs seuls).
+"""
+
+import sys
+import os
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+COUCHES = [
+    ('gares', '/api/gares?all=true', ('wkt', 'geojson', 'polyline', 'binary', 'none')),
+    ('arcs', '/api/arcs', ('wkt', 'geojson', 'polyline')),
+    ('evenements', '/api/evenements?per_page=500', ('wkt', 'geojson', 'polyline', 'binary', 'none')),
+]
+
+# Lecteurs côté client : chaque fonction rend le nombre de coordonnées décodées
+LECTEURS_JS = r"""
+const fs = require('fs');
+const { performance } = require('perf_hooks');
+
+function pointsWkt(texte) {
+    return texte.split(',').map(p => p.trim().split(' ').map(Number));
+}
+function lireWkt(corps) {
+    let n = 0;
+    for (const item of JSON.parse(corps).data) {
+        const g = item.geometrie;
+        if (!g) continue;
+        const point = g.match(/POINT\(([^)]+)\)/);
+        if (point) { point[1].split(' ').map(Number); n++; continue; }
+        const parties = g.slice(g.indexOf('((') + 2, g.lastIndexOf('))')).split(/\)\s*,\s*\(/);
+        for (const partie of parties) n += pointsWkt(partie).length;
+    }
+    return n;
+}
+function lireGeojson(corps) {
+    let n = 0;
+    for (const item of JSON.parse(corps).data) {
+        const g = item.geometrie;
+        if (!g) continue;
+        if (g.type === 'Point') { n++; continue; }
+        for (const partie of (g.type === 'LineString' ? [g.coordinates] : g.coordinates)) n += partie.length;
+    }
+    return n;
+}
+function decoderPolyline(chaine, facteur) {
+    const points = [];
+    let i = 0, lat = 0, lon = 0;
+    while (i < chaine.length) {
+        const valeurs = [0, 0];
+        for (let k = 0; k < 2; k++) {
+            let v = 0, decalage = 0, octet;
+            do { octet = chaine.charCodeAt(i++) - 63; v |= (octet & 0x1f) << decalage; decalage += 5; } while (octet >= 0x20);
+            valeurs[k] = v & 1 ? ~(v >> 1) : v >> 1;
+        }
+        lat += valeurs[0]; lon += valeurs[1];
+        points.push([lon / facteur, lat / facteur]);
+    }
+    return points;
+}
+function lirePolyline(corps) {
+    let n = 0;
+    for (const item of JSON.parse(corps).data) {
+        const g = item.geometrie;
+        if (!g) continue;
+        for (const partie of (Array.isArray(g) ? g : [g])) n += decoderPolyline(partie, 1e5).length;
+    }
+    return n;
+}
+function lireBinary(corps) {
+    const buffer = corps.buffer.slice(corps.byteOffset, corps.byteOffset + corps.byteLength);
+    const n = new DataView(buffer).getUint32(4, true);
+    const ids = new Int32Array(buffer, 8, n);
+    const lons = new Float32Array(buffer, 8 + 4 * n, n);
+    const lats = new Float32Array(buffer, 8 + 8 * n, n);
+    return ids.length + lons.length + lats.length > 0 ? n : 0;
+}
+function lireAttributs(corps) {
+    JSON.parse(corps);
+    return 0;
+}
+
+const lecteurs = { wkt: lireWkt, geojson: lireGeojson, polyline: lirePolyline, binary: lireBinary, none: lireAttributs };
+const resultats = {};
+for (const [cle, chemin] of Object.entries(JSON.parse(process.argv[2]))) {
+    const format = cle.split(':')[1];
+    const corps = format === 'binary' ? fs.readFileSync(chemin) : fs.readFileSync(chemin, 'utf8');
+    let best = Infinity, n = 0;
+    for (let r = 0; r < 20; r++) {
+        const start = performance.now();
+        n = lecteurs[format](corps);
+        best = Math.min(best, performance.now() - start);
+    }
+    resultats[cle] = [best, n];
+}
+console.log(JSON.stringify(resultats));
+"""
+
+def timed(func, repeat=5):
+    """Meilleur temps CPU (en secondes) sur plusieurs exécutions"""
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def lire_python(corps, geom):
+    """Équivalent Python des lecteurs JavaScript : nombre de coordonnées décodées"""
+    import encodage_geometrie
+
+    if geom == 'binary':
+        return len(encodage_geometrie.decoder_points_binaire(corps)[0])
+    n = 0
+    for item in json.loads(corps)['data']:
+        g = item.get('geometrie')
+        if not g:
+            continue
+        if geom == 'wkt':
+            type_geojson, coordonnees = encodage_geometrie.parse_wkt(g)
+        elif geom == 'geojson':
+            type_geojson, coordonnees = g['type'], g['coordinates']
+        else:
+            parties = [encodage_geometrie.decoder_polyline(p) for p in (g if isinstance(g, list) else [g])]
+            type_geojson, coordonnees = 'MultiLineString', parties
+        if type_geojson == 'Point':
+            n += 1
+        else:
+            n += sum(len(p) for p in ([coordonnees] if type_geojson == 'LineString' else coordonnees))
+    return n
+
+def temps_client(corps_par_cle):
+    """{clé: (ms, coordonnées)} mesurés dans Node.js, ou en Python sans Node"""
+    node = shutil.which('node')
+    if node:
+        with tempfile.TemporaryDirectory() as dossier:
+            chemins = {}
+            for i, (cle, corps) in enumerate(corps_par_cle.items()):
+                chemins[cle] = os.path.join(dossier, f'{i}.bin')
+                with open(chemins[cle], 'wb') as f:
+                    f.write(corps)
+            script = os.path.join(dossier, 'lecteurs.js')
+            with open(script, 'w') as f:
+                f.write(LECTEURS_JS)
+            sortie = subprocess.run([node, script, json.dumps(chemins)], capture_output=True, text=True, check=True)
+        return 'Node.js', {cle: tuple(v) for cle, v in json.loads(sortie.stdout).items()}
+    resultats = {}
+    for cle, corps in corps_par_cle.items():
+        geom = cle.split(':')[1]
+        resultats[cle] = (timed(lambda: lire_python(corps, geom)) * 1000, lire_python(corps, geom))
+    return 'Python', resultats
+
+def benchmark_geometries():
+    """Lancer le benchmark complet"""
+    import fast_response
+    from app import app
+
+    print("🚂 ONCF GIS - Benchmark des encodages de géométrie")
+    print("=" * 60)
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+    corps_par_cle = {}
+    for couche, url, formats in COUCHES:
+        for geom in formats:
+            response = client.get(f"{url}{'&' if '?' in url else '?'}geom={geom}", headers={'Accept-Encoding': 'identity'})
+            if response.status_code != 200:
+                print(f"⚠️  {couche} geom={geom}: HTTP {response.status_code}, ignoré")
+                continue
+            corps_par_cle[f'{couche}:{geom}'] = response.get_data()
+
+    moteur, temps = temps_client(corps_par_cle)
+    algos = ['gzip'] + (['br'] if fast_response.BROTLI_AVAILABLE else [])
+    for couche, url, formats in COUCHES:
+        print(f"\n📊 {url} (lecture client: {moteur})")
+        reference = corps_par_cle.get(f'{couche}:wkt')
+        for geom in formats:
+            cle = f'{couche}:{geom}'
+            if cle not in corps_par_cle:
+                continue
+            brut = corps_par_cle[cle]
+            tailles = ' | '.join(f"{algo} {len(fast_response.compresser(brut, algo)):9,}" for algo in algos)
+            ratio = f"({len(brut) / len(reference):6.1%})" if reference else ''
+            ms, coordonnees = temps[cle]
+            print(f"   - {geom:<9} {len(brut):10,} octets {ratio} | {tailles} | "
+                  f"lecture {ms:7.2f} ms ({coordonnees:,} coordonnées)")
+
+if __name__ == "__main__":
+    benchmark_geometries()
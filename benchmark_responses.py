@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la couche de réponse (fast_response) sur les principaux endpoints
+
+Pour chaque endpoint, sur les vraies données :
+  1. la sérialisation : json de Flask (tri des clés, ensure_ascii) comparé à dumps_bytes (orjson)
+  2. la taille envoyée : brute, gzip et brotli (si installé), avec le temps CPU de compression
+  3. le temps CPU par requête complète (client de test Flask) selon l'Accept-Encoding
+Puis le coût de la conversion ligne par ligne des incidents (isoformat/strftime) évitée.
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ENDPOINTS = [
+    '/api/evenements?per_page=500',
+    '/api/gares?all=true',
+    '/api/arcs-multilines',
+    '/api/statistiques',
+    '/api/map/features?bbox=-10,27,0,36&zoom=8',
+    '/api/reference/bundle',
+]
+
+def timed(func, repeat=5):
+    """Meilleur temps CPU (en secondes) sur plusieurs exécutions"""
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def benchmark_serialisation(client, url):
+    """Sérialisation et compression du corps renvoyé par l'endpoint"""
+    import fast_response
+    from flask.json.provider import DefaultJSONProvider
+
+    body = client.get(url).get_data()
+    payload = json.loads(body)
+    brut = fast_response.dumps_bytes(payload)
+
+    def flask_json():
+        json.dumps(payload, sort_keys=DefaultJSONProvider.sort_keys, ensure_ascii=DefaultJSONProvider.ensure_ascii).encode('utf-8')
+
+    def fast_json():
+        fast_response.dumps_bytes(payload)
+
+    print(f"\n📊 {url}")
+    print(f"   - Sérialisation json (Flask)     {timed(flask_json) * 1000:8.2f} ms")
+    print(f"   - Sérialisation {fast_response.JSON_ENGINE:<16} {timed(fast_json) * 1000:8.2f} ms")
+    print(f"   - {'identity':<30} {len(brut):10,} octets")
+    algos = ['gzip'] + (['br'] if fast_response.BROTLI_AVAILABLE else [])
+    for algo in algos:
+        taille = len(fast_response.compresser(brut, algo))
+        duree = timed(lambda: fast_response.compresser(brut, algo))
+        print(f"   - {algo:<30} {taille:10,} octets ({taille / len(brut):6.1%}, {duree * 1000:6.2f} ms CPU)")
+
+def benchmark_requetes(client, url, repeat=5):
+    """Temps CPU par requête complète (vue + sérialisation + compression)"""
+    import fast_response
+
+    encodages = ['identity', 'gzip'] + (['br'] if fast_response.BROTLI_AVAILABLE else [])
+    resultats = []
+    for encodage in encodages:
+        # Sans validateur : la vue est exécutée à chaque fois (pas de 304)
+        duree = timed(lambda: client.get(url, headers={'Accept-Encoding': encodage}), repeat=repeat)
+        taille = len(client.get(url, headers={'Accept-Encoding': encodage}).get_data())
+        resultats.append(f"{encodage} {duree * 1000:.1f} ms / {taille:,} o")
+    print(f"   - Requête complète: {' | '.join(resultats)}")
+
+def benchmark_conversion_incidents():
+    """Ancienne conversion ligne par ligne des dates/heures comparée à la sérialisation native"""
+    import psycopg2.extras
+    import fast_response
+    from app import EVENEMENTS_SELECT, get_db_connection, get_order_clause, get_sort_key, serialize_evenement
+
+    conn = get_db_connection()
+    cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    cursor.execute(f"{EVENEMENTS_SELECT.format(sort_column=get_sort_key('date_desc')[0])} ORDER BY {get_order_clause('date_desc')} LIMIT 5000")
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    def ancien():
+        data = []
+        for evt in rows:
+            item = serialize_evenement(evt)
+            for cle in ('date_debut', 'date_fin'):
+                item[cle] = item[cle].isoformat() if item[cle] else None
+            for cle in ('heure_debut', 'heure_fin'):
+                item[cle] = item[cle].strftime('%H:%M:%S') if item[cle] else None
+            data.append(item)
+        json.dumps({'success': True, 'data': data}, sort_keys=True).encode('utf-8')
+
+    def nouveau():
+        fast_response.dumps_bytes({'success': True, 'data': [serialize_evenement(evt) for evt in rows]})
+
+    print(f"\n📊 Incidents: conversion + sérialisation de {len(rows):,} lignes")
+    ancien_s, nouveau_s = timed(ancien), timed(nouveau)
+    print(f"   - isoformat/strftime + json        {ancien_s * 1000:8.2f} ms")
+    print(f"   - natif + {fast_response.JSON_ENGINE:<25} {nouveau_s * 1000:8.2f} ms  (x{ancien_s / nouveau_s:.1f})")
+
+def benchmark_responses():
+    """Lancer le benchmark complet"""
+    from app import app
+
+    print("🚂 ONCF GIS - Benchmark de la sérialisation et de la compression des réponses")
+    print("=" * 60)
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+    for url in ENDPOINTS:
+        response = client.get(url)
+        if response.status_code != 200:
+            print(f"\n⚠️  {url}: HTTP {response.status_code}, ignoré")
+            continue
+        benchmark_serialisation(client, url)
+        benchmark_requetes(client, url)
+
+    benchmark_conversion_incidents()
+
+if __name__ == "__main__":
+    benchmark_responses()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Encodages compacts des géométries servies par l'API
+
+Les géométries sont servies par défaut en WKT WGS84 ("POINT(-7.58 33.57)", MULTILINESTRING des axes)
+que le client doit relire par expressions régulières. Le paramètre ?geom= de /api/gares, /api/arcs et
+/api/evenements négocie un encodage plus compact :
+  - wkt      : texte WKT, comportement historique (défaut)
+  - geojson  : objet géométrie GeoJSON, coordonnées arrondies à GEOM_DECIMALES décimales
+  - polyline : Google encoded polyline (une chaîne par point ou par partie de ligne)
+  - binary   : couches de points seulement, tableaux typés little-endian (encoder_points_binaire)
+  - none     : géométrie omise (attributs seuls, à joindre par id à une réponse binary)
+?precision= remplace le nombre de décimales (geojson) ou la précision (polyline).
+"""
+
+import os
+import re
+import struct
+
+import numpy as np
+
+GEOM_DECIMALES = int(os.getenv('GEOM_DECIMALES', 5))                      # 1e-5 degré ≈ 1,1 m
+GEOM_POLYLINE_PRECISION = int(os.getenv('GEOM_POLYLINE_PRECISION', 5))    # 5 : polyline Google standard
+GEOM_PRECISION_MAX = 6      # au-delà, les entiers zigzag dépassent 31 bits (décodeurs JavaScript)
+
+FORMATS_GEOMETRIE = ('wkt', 'geojson', 'polyline', 'binary', 'none')
+
+# Réponse binary : en-tête de 8 octets (signature, nombre de points n) puis trois tableaux
+# de n valeurs little-endian : identifiants Int32, longitudes Float32, latitudes Float32.
+# Chaque tableau commence sur un multiple de 4 octets : lisible par new Int32Array(buffer, offset, n).
+BINAIRE_SIGNATURE = b'OGP1'
+BINAIRE_MIMETYPE = 'application/vnd.oncf.points'
+BINAIRE_ENTETE = struct.Struct('<4sI')
+
+SEPARATEUR_PARTIES = re.compile(r'\)\s*,\s*\(')
+
+def format_demande(args, binaire=True):
+    """(format, précision) demandés par ?geom= et ?precision= ; ValueError si non valides"""
+    geom = (args.get('geom') or 'wkt').strip().lower()
+    if geom not in FORMATS_GEOMETRIE:
+        raise ValueError(f"Paramètre geom invalide: {geom} (attendu: {', '.join(FORMATS_GEOMETRIE)})")
+    if geom == 'binary' and not binaire:
+        raise ValueError("Le format binary est réservé aux couches de points")
+    precision = args.get('precision')
+    if precision in (None, ''):
+        return geom, GEOM_POLYLINE_PRECISION if geom == 'polyline' else GEOM_DECIMALES
+    try:
+        precision = int(precision)
+    except ValueError:
+        raise ValueError(f"Paramètre precision invalide: {precision}")
+    if not 0 <= precision <= GEOM_PRECISION_MAX:
+        raise ValueError(f"Paramètre precision hors limites: {precision} (0 à {GEOM_PRECISION_MAX})")
+    return geom, precision
+
+def parse_wkt(wkt):
+    """(type GeoJSON, coordonnées) d'un WKT POINT, LINESTRING ou MULTILINESTRING (préfixe SRID ignoré)"""
+    texte = wkt.split(';', 1)[-1].strip()
+    type_wkt, _, corps = texte.partition('(')
+    type_wkt = type_wkt.strip().upper()
+    corps = corps.strip()
+    if type_wkt == 'POINT':
+        return 'Point', [float(v) for v in corps.rstrip(')').split()[:2]]
+    if type_wkt == 'LINESTRING':
+        return 'LineString', parse_points(corps.rstrip(')'))
+    if type_wkt == 'MULTILINESTRING':
+        corps = corps.lstrip('(').rstrip(')')
+        return 'MultiLineString', [parse_points(partie) for partie in SEPARATEUR_PARTIES.split(corps)]
+    raise ValueError(f"Géométrie WKT non prise en charge: {type_wkt}")
+
+def parse_points(texte):
+    """[[lon, lat], ...] d'une liste de points WKT 'x y, x y, ...'"""
+    return [[float(v) for v in point.split()[:2]] for point in texte.split(',')]
+
+def quantifier(coordonnees, decimales):
+    """Coordonnées (point, ligne ou parties) arrondies à un nombre de décimales"""
+    if coordonnees and isinstance(coordonnees[0], (int, float)):
+        return [round(v, decimales) for v in coordonnees]
+    return [quantifier(c, decimales) for c in coordonnees]
+
+def encoder_polyline(points, precision=GEOM_POLYLINE_PRECISION):
+    """Google encoded polyline d'une suite de points [lon, lat] (encodés dans l'ordre lat, lon)"""
+    valeurs = np.round(np.asarray(points, dtype=float).reshape(-1, 2)[:, ::-1] * 10 ** precision).astype(np.int64)
+    deltas = np.diff(valeurs, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    zigzag = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+    caracteres = []
+    for v in zigzag.tolist():
+        while v >= 0x20:
+            caracteres.append(chr((0x20 | (v & 0x1f)) + 63))
+            v >>= 5
+        caracteres.append(chr(v + 63))
+    return ''.join(caracteres)
+
+def decoder_polyline(chaine, precision=GEOM_POLYLINE_PRECISION):
+    """Points [lon, lat] d'une polyline encodée"""
+    valeurs, v, decalage = [], 0, 0
+    for caractere in chaine:
+        octet = ord(caractere) - 63
+        v |= (octet & 0x1f) << decalage
+        decalage += 5
+        if octet < 0x20:
+            valeurs.append(~(v >> 1) if v & 1 else v >> 1)
+            v, decalage = 0, 0
+    latlon = np.cumsum(np.asarray(valeurs, dtype=np.int64).reshape(-1, 2), axis=0) / 10 ** precision
+    return latlon[:, ::-1].tolist()
+
+def encoder_geometrie(wkt, geom, precision):
+    """Géométrie WKT dans l'encodage demandé (wkt et none exclus : traités par l'appelant)"""
+    if wkt is None:
+        return None
+    type_geojson, coordonnees = parse_wkt(wkt)
+    if geom == 'geojson':
+        return {'type': type_geojson, 'coordinates': quantifier(coordonnees, precision)}
+    if type_geojson == 'Point':
+        return encoder_polyline([coordonnees], precision)
+    if type_geojson == 'LineString':
+        return [encoder_polyline(coordonnees, precision)]
+    return [encoder_polyline(partie, precision) for partie in coordonnees]
+
+def encoder_elements(elements, geom, precision, cle='geometrie'):
+    """Réencoder sur place la géométrie WKT de chaque élément (geojson, polyline ou none)"""
+    if geom == 'wkt':
+        return elements
+    for element in elements:
+        if geom == 'none':
+            element.pop(cle, None)
+        else:
+            element[cle] = encoder_geometrie(element.get(cle), geom, precision)
+    return elements
+
+def encoder_points_binaire(elements, cle='geometrie'):
+    """Corps binaire (en-tête, ids Int32, lon Float32, lat Float32) des éléments à géométrie POINT WKT
+
+    Les éléments sans géométrie ont des coordonnées NaN.
+    """
+    n = len(elements)
+    ids = np.empty(n, dtype='<i4')
+    lons = np.full(n, np.nan, dtype='<f4')
+    lats = np.full(n, np.nan, dtype='<f4')
+    for i, element in enumerate(elements):
+        ids[i] = element['id']
+        if element.get(cle):
+            lons[i], lats[i] = parse_wkt(element[cle])[1]
+    return BINAIRE_ENTETE.pack(BINAIRE_SIGNATURE, n) + ids.tobytes() + lons.tobytes() + lats.tobytes()
+
+def decoder_points_binaire(brut):
+    """(ids, lons, lats) d'un corps produit par encoder_points_binaire"""
+    signature, n = BINAIRE_ENTETE.unpack_from(brut)
+    if signature != BINAIRE_SIGNATURE:
+        raise ValueError(f"Signature binaire inattendue: {signature!r}")
+    debut = BINAIRE_ENTETE.size
+    ids = np.frombuffer(brut, dtype='<i4', count=n, offset=debut)
+    lons = np.frombuffer(brut, dtype='<f4', count=n, offset=debut + 4 * n)
+    lats = np.frombuffer(brut, dtype='<f4', count=n, offset=debut + 8 * n)
+    return ids, lons, lats
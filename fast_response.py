@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Couche de réponse : sérialisation JSON rapide et compression négociée
+
+- FastJSONProvider remplace le fournisseur JSON de Flask (jsonify, app.json.dumps) : orjson
+  quand il est installé, sinon le module json standard. Les datetime, date et time sont
+  écrits au format ISO 8601 et les Decimal / scalaires numpy comme des nombres, sans
+  conversion ligne par ligne dans les vues.
+- compress_response() compresse en brotli (si le module brotli est installé) ou en gzip
+  les réponses textuelles au-delà d'un seuil, selon l'en-tête Accept-Encoding du client.
+
+Activation : init_app(app), réglages lus dans l'environnement (voir env.example).
+"""
+
+import datetime
+import decimal
+import gzip
+import inspect
+import json
+import os
+import zlib
+
+from flask.json.provider import DefaultJSONProvider
+
+# Imports optionnels (repli sur json / gzip)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+JSON_ENGINE = os.getenv('JSON_ENGINE', 'orjson')                   # orjson (si installé) ou json
+if not ORJSON_AVAILABLE:
+    JSON_ENGINE = 'json'
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))      # octets, en dessous : réponse envoyée telle quelle
+COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))   # 4-5 : bon compromis pour du contenu dynamique
+COMPRESS_ALGORITHMS = [a.strip() for a in os.getenv('COMPRESS_ALGORITHMS', 'br,gzip').split(',') if a.strip()]
+COMPRESS_MIMETYPES = {
+    'application/json', 'application/geo+json', 'application/x-ndjson',
+    'application/vnd.mapbox-vector-tile', 'application/vnd.oncf.points', 'application/javascript',
+    'text/html', 'text/css', 'text/plain', 'text/csv',
+}
+
+if ORJSON_AVAILABLE:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def json_default(o):
+    """Types non natifs pour json / orjson : Decimal, dates, scalaires et tableaux numpy"""
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
+        return o.isoformat()
+    if np is not None:
+        if isinstance(o, np.generic):
+            return o.item()
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f"Objet de type {type(o).__name__} non sérialisable en JSON")
+
+def dumps_bytes(obj):
+    """Sérialiser en JSON compact (UTF-8, clés dans l'ordre d'insertion)"""
+    if JSON_ENGINE == 'orjson':
+        return orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Fournisseur JSON de Flask basé sur dumps_bytes()
+
+    Les appels avec options explicites (indent, sort_keys...) passent par le module json
+    standard avec le même json_default.
+    """
+    sort_keys = False
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        if not kwargs:
+            return dumps_bytes(obj).decode('utf-8')
+        kwargs.setdefault('default', json_default)
+        kwargs.setdefault('ensure_ascii', False)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if JSON_ENGINE == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+def choisir_encodage(accept_encoding):
+    """Premier algorithme de COMPRESS_ALGORITHMS accepté par le client (q > 0), sinon None"""
+    acceptes = {}
+    for element in accept_encoding.split(','):
+        nom, _, params = element.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        acceptes[nom.strip().lower()] = q
+    for algo in COMPRESS_ALGORITHMS:
+        if algo == 'br' and not BROTLI_AVAILABLE:
+            continue
+        if acceptes.get(algo, acceptes.get('*', 0)) > 0:
+            return algo
+    return None
+
+def compresser(data, algo):
+    if algo == 'br':
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+def compresser_flux(chunks, algo):
+    """Compression à la volée d'une réponse streamée (un bloc compressé par bloc produit)"""
+    if algo == 'br':
+        compresseur = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compresseur.process(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            data += compresseur.flush()
+            if data:
+                yield data
+        yield compresseur.finish()
+    else:
+        compresseur = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compresseur.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            data += compresseur.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compresseur.flush()
+
+def compress_response(response, accept_encoding):
+    """Compresser la réponse si son type, sa taille et l'en-tête Accept-Encoding le permettent"""
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    algo = choisir_encodage(accept_encoding or '')
+    if algo is None:
+        return response
+
+    # Les pages d'erreur (HTTPException) arrivent dans un ClosingIterator, vu comme un flux :
+    # seul un vrai générateur est compressé à la volée, le reste est lu pour appliquer le seuil
+    if response.is_streamed and not inspect.isgenerator(response.response):
+        response.make_sequence()
+    if response.is_streamed:
+        response.response = compresser_flux(response.response, algo)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(compresser(data, algo))
+    response.headers['Content-Encoding'] = algo
+    # Un ETag fort désigne un corps octet par octet : il devient faible une fois compressé
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def init_app(app):
+    """Installer le fournisseur JSON et la compression des réponses sur l'application"""
+    from flask import request
+
+    app.json = FastJSONProvider(app)
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, request.headers.get('Accept-Encoding', ''))
+
+    print(f"⚡ Réponses: JSON {JSON_ENGINE}, compression {', '.join(a for a in COMPRESS_ALGORITHMS if a != 'br' or BROTLI_AVAILABLE) or 'désactivée'} "
+          f"au-delà de {COMPRESS_MIN_SIZE} octets")
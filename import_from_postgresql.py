@@ -215,39 +215,18 @@ def copy_table_data(source_schema, source_table, target_schema, target_table, co
         conn.close()
 
 def create_indexes():
-    """Créer les index pour optimiser les performances"""
+    """Créer les index pour optimiser les performances (migrations versionnées de migrate_indexes.py)"""
+    from migrate_indexes import apply_index_migrations
+
     conn = connect_to_database()
     if not conn:
         return
     
-    cursor = conn.cursor()
-    
-    indexes = [
-        "CREATE INDEX IF NOT EXISTS idx_gpr_gares_axe ON gpr.gpd_gares_ref(axe);",
-        "CREATE INDEX IF NOT EXISTS idx_gpr_gares_type ON gpr.gpd_gares_ref(typegare);",
-        "CREATE INDEX IF NOT EXISTS idx_gpr_gares_ville ON gpr.gpd_gares_ref(villes_ville);",
-        "CREATE INDEX IF NOT EXISTS idx_gpr_arcs_axe ON gpr.graphe_arc(axe);",
-        "CREATE INDEX IF NOT EXISTS idx_gpr_evenements_date ON gpr.ge_evenement(date_debut);",
-        "CREATE INDEX IF NOT EXISTS idx_gpr_evenements_statut ON gpr.ge_evenement(statut);",
-        "CREATE INDEX IF NOT EXISTS idx_gpr_evenements_type ON gpr.ge_evenement(type_id);",
-        "CREATE INDEX IF NOT EXISTS idx_gpr_types_actif ON gpr.ref_types(actif);",
-        "CREATE INDEX IF NOT EXISTS idx_gpr_localisation_axe ON gpr.ge_localisation(axe);"
-    ]
-    
     try:
-        for index_sql in indexes:
-            try:
-                cursor.execute(index_sql)
-                print(f"✅ Index créé: {index_sql.split('idx_')[1].split(' ')[0]}")
-            except Exception as e:
-                print(f"⚠️  Erreur index: {e}")
-        
-        conn.commit()
-        
+        apply_index_migrations(conn)
     except Exception as e:
         print(f"❌ Erreur création indexes: {e}")
     finally:
-        cursor.close()
         conn.close()
 
 def import_all_data():
@@ -7,7 +7,6 @@ Compatible avec Python 3.13
 import psycopg2
 import psycopg2.extras
 import os
-import csv
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -196,7 +195,9 @@ def parse_boolean(bool_str):
     return bool_str.lower() in ('t', 'true', '1', 'yes', 'oui')
 
 def import_csv_file(cursor, csv_file, table_name, columns_mapping):
-    """Importer un fichier CSV dans une table"""
+    """Importer un fichier CSV dans une table (différentiel par COPY, voir bulk_import.py)"""
+    from bulk_import import delta_csv, reset_sequence
+
     csv_path = f"sql_data/{csv_file}"
     
     if not os.path.exists(csv_path):
@@ -204,56 +205,17 @@ def import_csv_file(cursor, csv_file, table_name, columns_mapping):
         return 0
     
     try:
-        # Vider la table existante
-        cursor.execute(f"TRUNCATE TABLE gpr.{table_name} RESTART IDENTITY CASCADE;")
-        
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            rows_inserted = 0
-            
-            for row_num, row in enumerate(reader, 1):
-                try:
-                    # Préparer les données selon le mapping
-                    data = {}
-                    for i, (col_name, col_type) in enumerate(columns_mapping.items()):
-                        if i < len(row):
-                            value = row[i].strip() if row[i] else None
-                            
-                            if col_type == 'int' and value:
-                                data[col_name] = int(value) if value.isdigit() else None
-                            elif col_type == 'float' and value:
-                                try:
-                                    data[col_name] = float(value.replace(',', '.'))
-                                except:
-                                    data[col_name] = None
-                            elif col_type == 'datetime' and value:
-                                data[col_name] = parse_datetime(value)
-                            elif col_type == 'time' and value:
-                                data[col_name] = parse_time(value)
-                            elif col_type == 'bool' and value:
-                                data[col_name] = parse_boolean(value)
-                            else:
-                                data[col_name] = value if value else None
-                        else:
-                            data[col_name] = None
-                    
-                    # Construire la requête d'insertion
-                    columns = list(data.keys())
-                    values = list(data.values())
-                    
-                    placeholders = ', '.join(['%s'] * len(columns))
-                    columns_str = ', '.join(columns)
-                    
-                    query = f"INSERT INTO gpr.{table_name} ({columns_str}) VALUES ({placeholders})"
-                    cursor.execute(query, values)
-                    rows_inserted += 1
-                    
-                except Exception as e:
-                    print(f"⚠️  Erreur ligne {row_num} dans {csv_file}: {e}")
-                    continue
+        # Seules les lignes nouvelles, modifiées ou disparues du CSV sont écrites
+        spec = {'fichier': csv_file, 'colonnes': list(columns_mapping.items())}
+        stats = delta_csv(cursor, table_name, spec)
+        reset_sequence(cursor, table_name)
         
-        print(f"✅ {rows_inserted} lignes importées dans {table_name}")
-        return rows_inserted
+        if stats['rejets']:
+            print(f"⚠️  {stats['rejets']} lignes rejetées dans {csv_file} -> {stats['fichier_rejets']}")
+        changements = stats['changements']
+        print(f"✅ {stats['lignes']} lignes lues pour {table_name}: {len(changements['insertions'])} insérées, "
+              f"{len(changements['modifications'])} modifiées, {len(changements['suppressions'])} supprimées")
+        return stats['lignes']
         
     except Exception as e:
         print(f"❌ Erreur lors de l'import de {csv_file}: {e}")
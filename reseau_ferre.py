@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Graphe du réseau ferré en mémoire : segments de gpr.graphe_arc et gares
+
+Nœuds : extrémités de segments confondues (RESEAU_SNAP_TOLERANCE), et jonctions où
+l'extrémité libre d'un segment touche le milieu d'un autre (RESEAU_JONCTION_TOLERANCE),
+qui est alors coupé en deux arêtes. Arêtes : portions de segments entre deux nœuds,
+pondérées par leur longueur réelle en mètres (longueur EPSG:3857 x cos(latitude)).
+
+Représentation compacte en tableaux d'adjacence (CSR) numpy : les voisins du nœud n sont
+indices[indptr[n]:indptr[n + 1]], avec l'arête et le poids correspondants dans aretes et
+poids. Chaque gare est projetée sur la voie la plus proche (segment, abscisse curviligne).
+
+Requêtes :
+  - chemin(gare_a, gare_b) : plus court chemin (Dijkstra), distance, axes parcourus, géométrie
+  - lignes() : regroupement des axes par composante connexe du réseau
+  - connexions_axes() : axes qui se touchent en un nœud
+"""
+
+import os
+import re
+import math
+import heapq
+from collections import defaultdict
+
+import numpy as np
+
+from axes_geometrie import UnionFind, fusionner_proches, parse_linestring
+from vector_tiles import WEB_MERCATOR_RAYON, mercator_to_lonlat
+
+RESEAU_SNAP_TOLERANCE = float(os.getenv('RESEAU_SNAP_TOLERANCE', 10))          # m, extrémités confondues
+RESEAU_JONCTION_TOLERANCE = float(os.getenv('RESEAU_JONCTION_TOLERANCE', 50))  # m, extrémité libre -> milieu d'un segment
+RESEAU_GARE_TOLERANCE = float(os.getenv('RESEAU_GARE_TOLERANCE', 2000))        # m, distance max d'une gare à la voie
+
+POINT_RE = re.compile(r'POINT\s*\(\s*([-\d.eE+]+)\s+([-\d.eE+]+)')
+
+def facteur_echelle(ys):
+    """Mètres réels par mètre EPSG:3857 à l'ordonnée y (cos de la latitude)"""
+    return np.cos(2 * np.arctan(np.exp(np.asarray(ys, dtype=float) / WEB_MERCATOR_RAYON)) - np.pi / 2)
+
+def parse_point(geometrie):
+    """(x, y) d'un 'SRID=3857;POINT (x y)', None si illisible"""
+    match = POINT_RE.search(geometrie or '')
+    if not match:
+        return None
+    x, y = float(match.group(1)), float(match.group(2))
+    return (x, y) if math.isfinite(x) and math.isfinite(y) else None
+
+class ReseauFerre:
+    """Graphe du réseau construit une fois, interrogé en lecture seule (partageable entre threads)"""
+
+    def __init__(self, segments, gares=(), snap=RESEAU_SNAP_TOLERANCE, jonction=RESEAU_JONCTION_TOLERANCE,
+                 tolerance_gare=RESEAU_GARE_TOLERANCE):
+        """segments : [{'id', 'nom_axe', 'pk_debut', 'coords': [(x, y), ...]}] en EPSG:3857
+        gares : [{'id', 'code_gare', 'nom', 'x', 'y'}] en EPSG:3857
+        """
+        self.segments = [s for s in segments if len(s['coords']) >= 2]
+        self.coords = [np.asarray(s['coords'], dtype=float) for s in self.segments]
+        self.cumuls = []
+        for c in self.coords:
+            longueurs = np.hypot(*np.diff(c, axis=0).T) * facteur_echelle((c[1:, 1] + c[:-1, 1]) / 2)
+            self.cumuls.append(np.concatenate(([0.0], np.cumsum(longueurs))))
+        self._indexer_portions(max(tolerance_gare, jonction, snap))
+        self._construire_graphe(snap, jonction)
+
+        self.gares = {}
+        self._cles_gares = {}
+        for gare in gares:
+            self._ajouter_gare(gare, tolerance_gare)
+
+    # --- Géométrie ---------------------------------------------------------------------
+
+    def _indexer_portions(self, tolerance):
+        """Portions [p0, p1] de tous les segments, indexées par grille pour la projection de points"""
+        if self.coords:
+            self._p0 = np.vstack([c[:-1] for c in self.coords])
+            self._p1 = np.vstack([c[1:] for c in self.coords])
+            self._portion_segment = np.concatenate([np.full(len(c) - 1, i) for i, c in enumerate(self.coords)])
+            self._portion_t0 = np.concatenate([cumul[:-1] for cumul in self.cumuls])
+            self._portion_longueur = np.concatenate([np.diff(cumul) for cumul in self.cumuls])
+        else:
+            self._p0 = self._p1 = np.zeros((0, 2))
+            self._portion_segment = np.zeros(0, dtype=int)
+            self._portion_t0 = self._portion_longueur = np.zeros(0)
+
+        # Pas de grille en mètres EPSG:3857 couvrant la tolérance à la latitude la plus haute
+        ys = np.concatenate([self._p0[:, 1], [0.0]])
+        self._pas = tolerance / max(float(facteur_echelle(ys).min()), 0.1)
+        self._grille = defaultdict(list)
+        mins = np.floor(np.minimum(self._p0, self._p1) / self._pas).astype(int)
+        maxs = np.floor(np.maximum(self._p0, self._p1) / self._pas).astype(int)
+        for k, ((x0, y0), (x1, y1)) in enumerate(zip(mins.tolist(), maxs.tolist())):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self._grille[(cx, cy)].append(k)
+
+    def projeter(self, x, y, exclure=None):
+        """Point de voie le plus proche de (x, y) : (segment, abscisse en m, distance en m), None si trop loin"""
+        cx, cy = math.floor(x / self._pas), math.floor(y / self._pas)
+        candidats = {k for dx in (-1, 0, 1) for dy in (-1, 0, 1) for k in self._grille.get((cx + dx, cy + dy), ())}
+        if exclure is not None:
+            candidats = {k for k in candidats if self._portion_segment[k] != exclure}
+        if not candidats:
+            return None
+        k = np.fromiter(candidats, dtype=int)
+        p0, d = self._p0[k], self._p1[k] - self._p0[k]
+        l2 = (d ** 2).sum(axis=1)
+        u = np.clip(((x - p0[:, 0]) * d[:, 0] + (y - p0[:, 1]) * d[:, 1]) / np.where(l2 > 0, l2, 1), 0, 1)
+        distances = np.hypot(p0[:, 0] + u * d[:, 0] - x, p0[:, 1] + u * d[:, 1] - y) * facteur_echelle(y)
+        meilleur = int(np.argmin(distances))
+        portion = k[meilleur]
+        return (int(self._portion_segment[portion]),
+                float(self._portion_t0[portion] + u[meilleur] * self._portion_longueur[portion]),
+                float(distances[meilleur]))
+
+    def point(self, segment, t):
+        """Coordonnées EPSG:3857 du point d'abscisse t (m) sur le segment"""
+        c, cumul = self.coords[segment], self.cumuls[segment]
+        return float(np.interp(t, cumul, c[:, 0])), float(np.interp(t, cumul, c[:, 1]))
+
+    def sous_ligne(self, segment, t_debut, t_fin):
+        """Sommets EPSG:3857 du segment entre deux abscisses, dans le sens t_debut -> t_fin"""
+        a, b = sorted((t_debut, t_fin))
+        c, cumul = self.coords[segment], self.cumuls[segment]
+        milieu = (cumul > a) & (cumul < b)
+        points = [self.point(segment, a)] + [tuple(p) for p in c[milieu].tolist()] + [self.point(segment, b)]
+        return points if t_debut <= t_fin else points[::-1]
+
+    # --- Graphe ------------------------------------------------------------------------
+
+    def _construire_graphe(self, snap, jonction):
+        n = len(self.segments)
+        extremites = []
+        for c in self.coords:
+            extremites.append(tuple(c[0]))
+            extremites.append(tuple(c[-1]))
+        noeuds = UnionFind(2 * n)
+        fusionner_proches(extremites, snap, noeuds)
+
+        # Jonctions : une extrémité libre proche du milieu d'un autre segment le coupe en deux
+        degres = defaultdict(int)
+        for e in range(2 * n):
+            degres[noeuds.find(e)] += 1
+        coupures = defaultdict(list)
+        for e in range(2 * n):
+            if degres[noeuds.find(e)] != 1:
+                continue
+            projection = self.projeter(*extremites[e], exclure=e // 2)
+            if projection is None or projection[2] > jonction:
+                continue
+            segment, t, _ = projection
+            if t <= snap:
+                noeuds.union(e, 2 * segment)
+            elif t >= self.cumuls[segment][-1] - snap:
+                noeuds.union(e, 2 * segment + 1)
+            else:
+                coupures[segment].append((t, e))
+
+        racines = {}
+        def noeud(e):
+            return racines.setdefault(noeuds.find(e), len(racines))
+
+        arete_a, arete_b, arete_segment, arete_t0, arete_t1 = [], [], [], [], []
+        for i in range(n):
+            bornes = [(0.0, noeud(2 * i))] + [(t, noeud(e)) for t, e in sorted(coupures[i])] \
+                + [(float(self.cumuls[i][-1]), noeud(2 * i + 1))]
+            for (t0, a), (t1, b) in zip(bornes, bornes[1:]):
+                arete_a.append(a)
+                arete_b.append(b)
+                arete_segment.append(i)
+                arete_t0.append(t0)
+                arete_t1.append(t1)
+
+        self.nombre_noeuds = len(racines)
+        self.arete_a = np.array(arete_a, dtype=np.int32)
+        self.arete_b = np.array(arete_b, dtype=np.int32)
+        self.arete_segment = np.array(arete_segment, dtype=np.int32)
+        self.arete_t0 = np.array(arete_t0, dtype=float)
+        self.arete_t1 = np.array(arete_t1, dtype=float)
+        longueurs = self.arete_t1 - self.arete_t0
+
+        # Tableaux d'adjacence (CSR) : chaque arête dans les deux sens
+        m = len(arete_a)
+        sources = np.concatenate([self.arete_a, self.arete_b])
+        ordre = np.argsort(sources, kind='stable')
+        self.indices = np.concatenate([self.arete_b, self.arete_a])[ordre].astype(np.int32)
+        self.aretes = np.concatenate([np.arange(m), np.arange(m)])[ordre].astype(np.int32)
+        self.poids = longueurs[self.aretes]
+        self.indptr = np.zeros(self.nombre_noeuds + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=self.nombre_noeuds), out=self.indptr[1:])
+
+        # Composantes connexes
+        composantes = UnionFind(self.nombre_noeuds)
+        for a, b in zip(arete_a, arete_b):
+            composantes.union(a, b)
+        self.composante = np.array([composantes.find(k) for k in range(self.nombre_noeuds)], dtype=np.int32)
+
+        # Arêtes de chaque segment dans l'ordre des abscisses (recherche de l'arête d'un point)
+        self._aretes_segment = defaultdict(list)
+        for k, segment in enumerate(arete_segment):
+            self._aretes_segment[segment].append(k)
+
+    def arete(self, segment, t):
+        """Arête du segment qui contient l'abscisse t"""
+        aretes = self._aretes_segment[segment]
+        for k in aretes:
+            if t <= self.arete_t1[k]:
+                return k
+        return aretes[-1]
+
+    # --- Gares -------------------------------------------------------------------------
+
+    def _ajouter_gare(self, gare, tolerance):
+        projection = self.projeter(gare['x'], gare['y'])
+        if projection is None or projection[2] > tolerance:
+            return
+        segment, t, distance = projection
+        self.gares[gare['id']] = {**gare, 'segment': segment, 't': t, 'distance_voie_m': distance}
+        # Clé -> {priorité: [ids]} : un identifiant l'emporte sur un code gare, un code sur un nom
+        for priorite, cle in enumerate((str(gare['id']), gare.get('code_gare'), gare.get('nom'))):
+            if cle:
+                self._cles_gares.setdefault(str(cle).strip().upper(), {}).setdefault(priorite, []).append(gare['id'])
+
+    def candidats_gare(self, cle):
+        """Gares du réseau désignées par un identifiant, un code gare ou un nom exact (insensible à la casse)
+
+        Seules les correspondances du type le plus précis sont gardées (id, puis code, puis nom) ;
+        plusieurs gares partagent un même code ou un même nom dans gpd_gares_ref.
+        """
+        correspondances = self._cles_gares.get(str(cle).strip().upper())
+        if not correspondances:
+            return []
+        return [self.gares[gare_id] for gare_id in correspondances[min(correspondances)]]
+
+    def trouver_gare(self, cle):
+        """Gare désignée sans ambiguïté par cle (voir candidats_gare), None si inconnue ou ambiguë"""
+        candidats = self.candidats_gare(cle)
+        return candidats[0] if len(candidats) == 1 else None
+
+    # --- Requêtes ----------------------------------------------------------------------
+
+    def _extremites_arete(self, k, t):
+        """{nœud: distance} depuis l'abscisse t de l'arête k vers ses deux nœuds"""
+        couts = {}
+        for noeud, cout in ((int(self.arete_a[k]), t - self.arete_t0[k]), (int(self.arete_b[k]), self.arete_t1[k] - t)):
+            couts[noeud] = min(cout, couts.get(noeud, math.inf))
+        return couts
+
+    def chemin(self, gare_a, gare_b):
+        """Plus court chemin entre deux gares (dicts de trouver_gare), None si elles ne sont pas reliées
+
+        Retourne {'distance_m', 'axes': [(nom_axe, m), ...], 'coordonnees': [(lon, lat), ...]}.
+        """
+        arete_a = self.arete(gare_a['segment'], gare_a['t'])
+        arete_b = self.arete(gare_b['segment'], gare_b['t'])
+        departs = self._extremites_arete(arete_a, gare_a['t'])
+        arrivees = self._extremites_arete(arete_b, gare_b['t'])
+
+        meilleur, fin = math.inf, None
+        if arete_a == arete_b:
+            meilleur = abs(gare_a['t'] - gare_b['t'])
+
+        # Dijkstra multi-source sur les tableaux CSR, arrêté dès que le meilleur chemin est sûr
+        indptr, indices, aretes, poids = self.indptr, self.indices, self.aretes, self.poids
+        distances = dict(departs)
+        precedents = {}
+        tas = [(cout, noeud) for noeud, cout in departs.items()]
+        heapq.heapify(tas)
+        while tas:
+            d, noeud = heapq.heappop(tas)
+            if d >= meilleur:
+                break
+            if d > distances.get(noeud, math.inf):
+                continue
+            if noeud in arrivees and d + arrivees[noeud] < meilleur:
+                meilleur, fin = d + arrivees[noeud], noeud
+            for h in range(indptr[noeud], indptr[noeud + 1]):
+                voisin, nd = int(indices[h]), d + poids[h]
+                if nd < distances.get(voisin, math.inf):
+                    distances[voisin] = nd
+                    precedents[voisin] = (noeud, int(aretes[h]))
+                    heapq.heappush(tas, (nd, voisin))
+
+        if meilleur == math.inf:
+            return None
+
+        # Portions parcourues : (segment, abscisse de départ, abscisse d'arrivée)
+        if fin is None:
+            portions = [(gare_a['segment'], gare_a['t'], gare_b['t'])]
+        else:
+            chaine, noeud = [], fin
+            while noeud in precedents:
+                precedent, k = precedents[noeud]
+                chaine.append((precedent, k, noeud))
+                noeud = precedent
+            chaine.reverse()
+            depart = noeud
+
+            def abscisse(k, n):
+                return self.arete_t0[k] if n == self.arete_a[k] else self.arete_t1[k]
+
+            portions = [(gare_a['segment'], gare_a['t'], abscisse(arete_a, depart))]
+            for u, k, v in chaine:
+                portions.append((int(self.arete_segment[k]), abscisse(k, u), abscisse(k, v)))
+            portions.append((gare_b['segment'], abscisse(arete_b, fin), gare_b['t']))
+
+        axes, points = [], []
+        for segment, t0, t1 in portions:
+            longueur = abs(t1 - t0)
+            nom_axe = self.segments[segment]['nom_axe']
+            if axes and axes[-1][0] == nom_axe:
+                axes[-1][1] += longueur
+            elif longueur > 0:
+                axes.append([nom_axe, longueur])
+            for p in self.sous_ligne(segment, t0, t1):
+                if not points or p != points[-1]:
+                    points.append(p)
+        lons, lats = mercator_to_lonlat([p[0] for p in points], [p[1] for p in points])
+        return {
+            'distance_m': float(meilleur),
+            'axes': [(nom_axe, float(longueur)) for nom_axe, longueur in axes],
+            'coordonnees': list(zip(lons.tolist(), lats.tolist())),
+        }
+
+    def connexions_axes(self):
+        """{nom_axe: [axes partageant au moins un nœud]}"""
+        axes_noeud = defaultdict(set)
+        for k, segment in enumerate(self.arete_segment.tolist()):
+            nom_axe = self.segments[segment]['nom_axe']
+            axes_noeud[int(self.arete_a[k])].add(nom_axe)
+            axes_noeud[int(self.arete_b[k])].add(nom_axe)
+        connexions = defaultdict(set)
+        for axes in axes_noeud.values():
+            for nom_axe in axes:
+                connexions[nom_axe].update(axes - {nom_axe})
+        return {nom_axe: sorted(autres) for nom_axe, autres in connexions.items()}
+
+    def lignes(self):
+        """Axes regroupés par composante connexe, de la plus longue à la plus courte
+
+        Un axe coupé par une lacune est rangé dans la composante où il a le plus de longueur.
+        Retourne [{'axes': [nom_axe, ...], 'longueur_m': m}].
+        """
+        longueurs = defaultdict(lambda: defaultdict(float))
+        for k, segment in enumerate(self.arete_segment.tolist()):
+            composante = int(self.composante[self.arete_a[k]])
+            longueurs[self.segments[segment]['nom_axe']][composante] += self.arete_t1[k] - self.arete_t0[k]
+        groupes = defaultdict(list)
+        for nom_axe, par_composante in longueurs.items():
+            groupes[max(par_composante, key=par_composante.get)].append(nom_axe)
+        lignes = [{'axes': sorted(axes), 'longueur_m': float(sum(sum(longueurs[a].values()) for a in axes))}
+                  for axes in groupes.values()]
+        return sorted(lignes, key=lambda ligne: (-ligne['longueur_m'], ligne['axes']))
+
+    def position_axe(self, nom_axe):
+        """(lon, lat) du point à mi-longueur de l'axe (segments dans l'ordre des PK), None si absent"""
+        segments = sorted((i for i, s in enumerate(self.segments) if s['nom_axe'] == nom_axe),
+                          key=lambda i: (float(self.segments[i]['pk_debut']) if self.segments[i].get('pk_debut') is not None else math.inf,
+                                         self.segments[i]['id']))
+        if not segments:
+            return None
+        reste = sum(self.cumuls[i][-1] for i in segments) / 2
+        for i in segments:
+            if reste <= self.cumuls[i][-1]:
+                break
+            reste -= self.cumuls[i][-1]
+        lons, lats = mercator_to_lonlat(*self.point(i, min(reste, self.cumuls[i][-1])))
+        return float(lons), float(lats)
+
+def charger_reseau(cursor):
+    """Construire le graphe depuis gpr.graphe_arc et gpr.gpd_gares_ref"""
+    cursor.execute("""
+        SELECT id, nom_axe, pk_debut, geometrie FROM gpr.graphe_arc
+        WHERE nom_axe IS NOT NULL
+        ORDER BY id
+    """)
+    segments = []
+    for arc_id, nom_axe, pk_debut, geometrie in cursor.fetchall():
+        coords = parse_linestring(geometrie)
+        if coords is not None:
+            segments.append({'id': arc_id, 'nom_axe': nom_axe, 'pk_debut': pk_debut, 'coords': coords})
+
+    cursor.execute("SELECT id, code_gare, nomgarefr, geometrie FROM gpr.gpd_gares_ref ORDER BY id")
+    gares = []
+    for gare_id, code_gare, nom, geometrie in cursor.fetchall():
+        point = parse_point(geometrie)
+        if point is not None:
+            gares.append({'id': gare_id, 'code_gare': code_gare, 'nom': nom, 'x': point[0], 'y': point[1]})
+    return ReseauFerre(segments, gares)
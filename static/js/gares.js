@@ -108,18 +108,16 @@ async function loadGares(page = 1, filters = {}) {
 
 /**
  * Charger les options de filtrage pour les gares
+ * Chaque option porte le nombre de gares correspondant compte tenu des autres filtres actifs
  */
-async function loadGareFilters() {
+async function loadGareFilters(filters = {}) {
     try {
-        const response = await fetch(`${API_BASE}/gares/filters`);
+        const params = new URLSearchParams(filters);
+        const response = await fetch(`${API_BASE}/gares/filters?${params}`);
         const data = await response.json();
         
         if (data.success) {
             gareFilters = data.data;
-            
-            // Extraire les options uniques depuis toutes les gares
-            extractUniqueFilterOptions();
-            
             populateFilterOptions();
             console.log('✅ Options de filtrage chargées');
         }
@@ -128,34 +126,6 @@ async function loadGareFilters() {
     }
 }
 
-/**
- * Extraire les options uniques pour les filtres
- */
-function extractUniqueFilterOptions() {
-    if (allGares.length === 0) return;
-    
-    const sections = new Set();
-    const types = new Set();
-    const etats = new Set();
-    const regions = new Set();
-    const villes = new Set();
-    
-    allGares.forEach(gare => {
-        if (gare.section) sections.add(gare.section);
-        if (gare.type) types.add(gare.type);
-        if (gare.etat) etats.add(gare.etat);
-        if (gare.region) regions.add(gare.region);
-        if (gare.ville) villes.add(gare.ville);
-    });
-    
-    // Mettre à jour les filtres avec les nouvelles options
-    gareFilters.sections = Array.from(sections).sort();
-    gareFilters.types = Array.from(types).sort();
-    gareFilters.etats = Array.from(etats).sort();
-    gareFilters.regions = Array.from(regions).sort();
-    gareFilters.villes = Array.from(villes).sort();
-}
-
 /**
  * Charger les statistiques
  */
@@ -193,75 +163,47 @@ function updateGareStatistics() {
     // Cette fonction met à jour seulement le nombre de gares filtrées
     // Les statistiques globales sont gérées par loadStatistics()
     
-    const filteredCount = filteredGares ? filteredGares.length : 0;
+    // Total de l'ensemble filtré (toutes pages) fourni par /api/gares/filters
+    const filteredCount = gareFilters.stats
+        ? gareFilters.stats.total_gares
+        : (filteredGares ? filteredGares.length : 0);
     document.getElementById('filteredGaresCount').textContent = filteredCount;
     
     console.log(`📊 Gares filtrées: ${filteredCount}`);
 }
 
 /**
- * Peupler les options de filtrage
+ * Peupler les options de filtrage (la sélection courante est conservée)
  */
 function populateFilterOptions() {
-    // Sections
-    const sectionSelect = document.getElementById('filterSection');
-    if (sectionSelect) {
-        sectionSelect.innerHTML = '<option value="">Toutes les sections</option>';
-        gareFilters.sections.forEach(section => {
-            const option = document.createElement('option');
-            option.value = section;
-            option.textContent = section;
-            sectionSelect.appendChild(option);
-        });
-    }
-    
-    // Types
-    const typeSelect = document.getElementById('filterType');
-    if (typeSelect) {
-        typeSelect.innerHTML = '<option value="">Tous les types</option>';
-        gareFilters.types.forEach(type => {
-            const option = document.createElement('option');
-            option.value = type;
-            option.textContent = type;
-            typeSelect.appendChild(option);
-        });
-    }
-    
-    // États
-    const etatSelect = document.getElementById('filterEtat');
-    if (etatSelect) {
-        etatSelect.innerHTML = '<option value="">Tous les états</option>';
-        gareFilters.etats.forEach(etat => {
-            const option = document.createElement('option');
-            option.value = etat;
-            option.textContent = etat;
-            etatSelect.appendChild(option);
-        });
-    }
-    
-    // Régions
-    const regionSelect = document.getElementById('filterRegion');
-    if (regionSelect) {
-        regionSelect.innerHTML = '<option value="">Toutes les régions</option>';
-        gareFilters.regions.forEach(region => {
-            const option = document.createElement('option');
-            option.value = region;
-            option.textContent = region;
-            regionSelect.appendChild(option);
-        });
-    }
+    const selects = [
+        ['filterSection', 'sections', 'Toutes les sections'],
+        ['filterType', 'types', 'Tous les types'],
+        ['filterEtat', 'etats', 'Tous les états'],
+        ['filterRegion', 'regions', 'Toutes les régions'],
+        ['filterVille', 'villes', 'Toutes les villes']
+    ];
     
-    // Villes
-    const villeSelect = document.getElementById('filterVille');
-    if (villeSelect) {
-        villeSelect.innerHTML = '<option value="">Toutes les villes</option>';
-        gareFilters.villes.forEach(ville => {
+    selects.forEach(([selectId, cle, libelle]) => {
+        const select = document.getElementById(selectId);
+        if (!select) return;
+        
+        const selection = select.value;
+        // Facettes avec comptes, sinon simple liste de valeurs
+        const options = gareFilters.facettes
+            ? gareFilters.facettes[cle]
+            : (gareFilters[cle] || []).map(valeur => ({ valeur: valeur, count: null }));
+        
+        select.innerHTML = `<option value="">${libelle}</option>`;
+        options.forEach(({ valeur, count }) => {
             const option = document.createElement('option');
-            option.value = ville;
-            option.textContent = ville;
-            villeSelect.appendChild(option);
+            option.value = valeur;
+            option.textContent = count === null ? valeur : `${valeur} (${count})`;
+            option.disabled = count === 0 && valeur !== selection;
+            select.appendChild(option);
         });
-    }
+        select.value = selection;
+    });
 }
 
 /**
@@ -295,7 +237,10 @@ async function applyFilters() {
         updateActiveFiltersDisplay();
         
         currentPage = 1;
-        await loadGares(currentPage, activeFilters);
+        await Promise.all([
+            loadGares(currentPage, activeFilters),
+            loadGareFilters(activeFilters)
+        ]);
         renderGares();
         
         // Mettre à jour les statistiques après avoir appliqué les filtres
@@ -643,6 +588,14 @@ function showGareDetails(gareId) {
                                     <td><strong>PLOF:</strong></td>
                                     <td>${gare.plof || 'Non défini'}</td>
                                 </tr>
+                                <tr>
+                                    <td><strong>Axe:</strong></td>
+                                    <td>${gare.axe_info ? `<span class="badge bg-primary">${gare.axe_info.axe}</span>` : 'Non défini'}</td>
+                                </tr>
+                                <tr>
+                                    <td><strong>PK sur l'axe:</strong></td>
+                                    <td>${gare.axe_info ? `${gare.axe_info.pk_texte} <small class="text-muted">(à ${gare.axe_info.distance_m} m de la voie)</small>` : 'Non défini'}</td>
+                                </tr>
                             </table>
                         </div>
                         <div class="col-md-6">
@@ -10,6 +10,7 @@ let currentPage = 1;
 let itemsPerPage = 50; // Augmenté de 12 à 50 pour afficher plus d'incidents
 let totalPages = 1;
 let totalIncidents = 0;
+let pageCursors = {}; // Curseurs de pagination (keyset) renvoyés par l'API, indexés par tri et numéro de page
 let selectedIncident = null;
 let incidentTypes = [];
 let incidentLocations = [];
@@ -70,6 +71,13 @@ async function loadIncidents(page = 1, filters = {}) {
             per_page: itemsPerPage
         });
         
+        // Réutiliser le curseur de la page s'il est connu (évite l'OFFSET sur les pages profondes)
+        if (page === 1) {
+            pageCursors = {};
+        } else if (pageCursors[`${filters.sort || ''}|${page}`]) {
+            params.append('cursor', pageCursors[`${filters.sort || ''}|${page}`]);
+        }
+        
         // Ajouter les filtres
         if (filters.status) params.append('statut', filters.status);
         if (filters.type) params.append('type_id', filters.type);
@@ -82,7 +90,12 @@ async function loadIncidents(page = 1, filters = {}) {
         if (filters.sort) params.append('sort', filters.sort);
         if (filters.startDate) params.append('start_date', filters.startDate);
         if (filters.endDate) params.append('end_date', filters.endDate);
-        if (filters.search) params.append('search', filters.search);
+        if (filters.search) {
+            // Recherche plein texte (racines françaises, classement par pertinence) ;
+            // le serveur revient à ILIKE si la migration n'est pas appliquée
+            params.append('search', filters.search);
+            params.append('search_mode', 'fulltext');
+        }
         if (filters.period) params.append('period', filters.period);
         
         const response = await fetch(`${API_BASE}/evenements?${params}`);
@@ -98,6 +111,9 @@ async function loadIncidents(page = 1, filters = {}) {
             
             // Mettre à jour la pagination
             if (data.pagination) {
+                if (data.pagination.next_cursor) {
+                    pageCursors[`${filters.sort || ''}|${page + 1}`] = data.pagination.next_cursor;
+                }
                 updatePagination(data.pagination);
                 updatePaginationInfo();
                 console.log(`✅ ${allIncidents.length} incidents chargés (page ${data.pagination.page}/${data.pagination.pages})`);
@@ -260,59 +276,29 @@ async function loadReferenceData() {
     console.log('📚 Chargement des données de référence...');
     
     try {
-        // Charger les types d'incidents
-        try {
-            const typesResponse = await fetch(`${API_BASE}/reference/types`);
-            if (typesResponse.ok) {
-                incidentTypes = await typesResponse.json();
-                populateSelect('incidentType', incidentTypes, 'id', 'intitule');
-            }
-        } catch (error) {
-            console.warn('⚠️ Erreur de connexion pour les types:', error.message);
-        }
-        
-        // Charger les sous-types
-        try {
-            const sousTypesResponse = await fetch(`${API_BASE}/reference/sous-types`);
-            if (sousTypesResponse.ok) {
-                incidentSousTypes = await sousTypesResponse.json();
-                populateSelect('incidentSousType', incidentSousTypes, 'id', 'intitule');
-            }
-        } catch (error) {
-            console.warn('⚠️ Erreur de connexion pour les sous-types:', error.message);
-        }
-        
-        // Charger les sources
+        // Types (avec leurs sous-types), sources, systèmes et entités en une seule requête
         try {
-            const sourcesResponse = await fetch(`${API_BASE}/reference/sources`);
-            if (sourcesResponse.ok) {
-                incidentSources = await sourcesResponse.json();
-                populateSelect('incidentSource', incidentSources, 'id', 'intitule');
-            }
-        } catch (error) {
-            console.warn('⚠️ Erreur de connexion pour les sources:', error.message);
-        }
-        
-        // Charger les systèmes
-        try {
-            const systemsResponse = await fetch(`${API_BASE}/reference/systemes`);
-            if (systemsResponse.ok) {
-                incidentSystemes = await systemsResponse.json();
-                populateSelect('incidentSystem', incidentSystemes, 'id', 'intitule');
-            }
-        } catch (error) {
-            console.warn('⚠️ Erreur de connexion pour les systèmes:', error.message);
-        }
-        
-        // Charger les entités
-        try {
-            const entitesResponse = await fetch(`${API_BASE}/reference/entites`);
-            if (entitesResponse.ok) {
-                incidentEntites = await entitesResponse.json();
-                populateSelect('incidentEntite', incidentEntites, 'id', 'intitule');
+            const bundleResponse = await fetch(`${API_BASE}/reference/bundle`);
+            if (bundleResponse.ok) {
+                const bundle = await bundleResponse.json();
+                if (bundle.success) {
+                    incidentTypes = bundle.data.types;
+                    incidentSousTypes = incidentTypes
+                        .flatMap(type => type.sous_types)
+                        .sort((a, b) => (a.intitule || '').localeCompare(b.intitule || '', 'fr'));
+                    incidentSources = bundle.data.sources;
+                    incidentSystemes = bundle.data.systemes;
+                    incidentEntites = bundle.data.entites;
+                    
+                    populateSelect('incidentType', incidentTypes, 'id', 'intitule');
+                    populateSelect('incidentSousType', incidentSousTypes, 'id', 'intitule');
+                    populateSelect('incidentSource', incidentSources, 'id', 'intitule');
+                    populateSelect('incidentSystem', incidentSystemes, 'id', 'intitule');
+                    populateSelect('incidentEntite', incidentEntites, 'id', 'intitule');
+                }
             }
         } catch (error) {
-            console.warn('⚠️ Erreur de connexion pour les entités:', error.message);
+            console.warn('⚠️ Erreur de connexion pour les référentiels:', error.message);
         }
         
         // Charger les localisations
@@ -677,10 +663,10 @@ function createIncidentCard(incident) {
             hour: '2-digit', minute: '2-digit'
         }) : 'Non définie';
     
-    // Description tronquée
+    // Description tronquée, ou extrait de la recherche plein texte (HTML échappé par le serveur)
     const description = incident.description || 'Aucune description disponible';
-    const shortDescription = description.length > 150 ? 
-        description.substring(0, 150) + '...' : description;
+    const shortDescription = incident.extrait_recherche || (description.length > 150 ? 
+        description.substring(0, 150) + '...' : description);
     
     col.innerHTML = `
         <div class="card incident-card ${statusClass}" onclick="showIncidentDetails(${incident.id})">
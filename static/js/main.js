@@ -441,6 +441,12 @@ class ONCFGIS {
     parseGeometry(geometryString) {
         if (!geometryString) return null;
         
+        // Encodages ?geom=geojson ({type, coordinates}) ou tableau [lon, lat]
+        if (typeof geometryString !== 'string') {
+            const coords = Array.isArray(geometryString) ? geometryString : geometryString.coordinates;
+            return coords && coords.length >= 2 ? [coords[1], coords[0]] : null;
+        }
+        
         try {
             // Parser la géométrie WKT
             const match = geometryString.match(/POINT\(([^)]+)\)/);
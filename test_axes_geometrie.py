@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test de l'assemblage topologique des axes et de la pyramide de niveaux de détail (axes_geometrie.py, /api/arcs)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def segment(arc_id, pk, coords, plod=None, plof=None):
+    return {'id': arc_id, 'pk_debut': pk, 'plod': plod, 'plof': plof, 'absd': 0, 'absf': 0, 'coords': coords}
+
+def test_axes_geometrie():
+    """Chaînage, géométrie inversée, embranchement, lacune ; tous les segments servis par /api/arcs"""
+
+    try:
+        from axes_geometrie import assembler_axe, niveau_zoom, niveaux_detail, parse_multilinestring
+
+        print("🔍 Test de l'assemblage des axes...")
+        print("=" * 50)
+
+        # 1. Segments contigus, le deuxième saisi à l'envers : une seule partie dans l'ordre des PK
+        axe = assembler_axe([segment(2, 1, [(200, 0), (100, 0)]), segment(1, 0, [(0, 0), (100, 0)]),
+                             segment(3, 2, [(200, 0), (300, 0)])])
+        ok = axe['parties'] == [[(0, 0), (100, 0), (200, 0), (300, 0)]] and axe['segments'] == [1, 2, 3]
+        print(f"{'✅' if ok else '❌'} Chaînage et géométrie inversée: {axe['parties']}")
+
+        # 2. Embranchement : trois parties depuis le nœud commun, pas de zig-zag
+        axe = assembler_axe([segment(1, 0, [(0, 0), (100, 0)]), segment(2, 1, [(100, 0), (200, 0)]),
+                             segment(3, 1.5, [(100, 0), (100, 100)])])
+        ok = len(axe['parties']) == 3 and axe['embranchements'] == 1
+        print(f"{'✅' if ok else '❌'} Embranchement: {len(axe['parties'])} parties, {axe['embranchements']} embranchement")
+
+        # 3. Lacune : deux parties distinctes
+        axe = assembler_axe([segment(1, 0, [(0, 0), (100, 0)]), segment(2, 5, [(5000, 0), (6000, 0)])])
+        ok = len(axe['parties']) == 2 and axe['lacunes'] == 1
+        print(f"{'✅' if ok else '❌'} Lacune: {len(axe['parties'])} parties, {axe['lacunes']} lacune")
+
+        # 4. Raccord plof -> plod malgré un petit écart géométrique
+        axe = assembler_axe([segment(1, 0, [(0, 0), (100, 0)], 0, 1), segment(2, 1, [(300, 0), (400, 0)], 1, 2)])
+        print(f"{'✅' if len(axe['parties']) == 1 else '❌'} Raccord par PK: {len(axe['parties'])} partie")
+
+        # 5. Pyramide : moins de sommets aux petits zooms, extrémités des parties conservées
+        zigzag = [(i * 100.0, (i % 2) * 20.0) for i in range(200)] + [(20000.0, 5000.0)]
+        niveaux = niveaux_detail([zigzag], zooms=[5, 13, 18])
+        sommets = [nombre for _, _, nombre, _ in niveaux]
+        ok = sommets[0] < sommets[1] < sommets[2] <= len(zigzag) and sommets[0] >= 2
+        print(f"{'✅' if ok else '❌'} Sommets par niveau (zooms 5, 13, 18): {sommets}/{len(zigzag)}")
+        partie = parse_multilinestring(niveaux[0][3])[0]
+        print(f"{'✅' if partie[0] == (0.0, 0.0) and len(partie) == sommets[0] else '❌'} Extrémités conservées: {partie[0]} ... {partie[-1]}")
+        ok = niveau_zoom(3, [5, 9]) == 5 and niveau_zoom(6, [5, 9]) == 9 and niveau_zoom(12, [5, 9]) is None
+        print(f"{'✅' if ok else '❌'} Niveau servi par zoom: 3 -> 5, 6 -> 9, 12 -> géométrie complète")
+
+        # 6. /api/arcs : un axe par nom_axe, tous les segments comptés (plus de limite à 50 lignes)
+        from app import app, get_db_connection
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(DISTINCT nom_axe), COUNT(*) FROM gpr.graphe_arc WHERE nom_axe IS NOT NULL")
+        nb_axes, nb_segments = cursor.fetchone()
+        cursor.close()
+        conn.close()
+
+        client = app.test_client()
+        data = client.get('/api/arcs').get_json().get('data', [])
+        servis = sum(arc['nombre_segments'] for arc in data)
+        ok = len(data) == nb_axes and all(arc['geometrie'].startswith('MULTILINESTRING((') for arc in data)
+        print(f"{'✅' if ok else '❌'} /api/arcs: {len(data)}/{nb_axes} axes en MULTILINESTRING")
+        print(f"{'✅' if servis == nb_segments else '⚠️ '} {servis}/{nb_segments} segments assemblés "
+              f"(les géométries illisibles sont ignorées)")
+        simplifies = client.get('/api/arcs?zoom=5').get_json().get('data', [])
+        complets = sum(arc['geometrie'].count(',') + 1 for arc in data)
+        reduits = sum(arc['geometrie'].count(',') + 1 for arc in simplifies)
+        ok = len(simplifies) == len(data) and reduits < complets and all(arc.get('niveau_zoom') == 5 for arc in simplifies)
+        print(f"{'✅' if ok else '❌'} /api/arcs?zoom=5: {reduits}/{complets} sommets")
+        for arc in data:
+            if arc['nombre_parties'] > 1:
+                print(f"   ℹ️  {arc['axe']}: {arc['nombre_parties']} parties, "
+                      f"{arc['nombre_embranchements']} embranchement(s), {arc['nombre_lacunes']} lacune(s)")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_axes_geometrie()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test des requêtes conditionnelles (ETag / Last-Modified) sur les endpoints de lecture
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_conditional_get():
+    """304 sur ETag ou date identique, 200 après une écriture sur la table lue"""
+
+    try:
+        from app import app, get_db_connection, invalidate_caches
+
+        print("🔍 Test des requêtes conditionnelles...")
+        print("=" * 50)
+
+        app.config['WTF_CSRF_ENABLED'] = False
+        client = app.test_client()
+        client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+        urls = ['/api/gares?all=true', '/api/evenements?per_page=50', '/api/statistiques',
+                '/api/reference/sous-types', '/api/arcs-names']
+
+        # 1. Seconde requête avec l'ETag reçu : 304 sans corps, sans exécuter la vue
+        for url in urls:
+            start = time.perf_counter()
+            response = client.get(url)
+            complet_ms = (time.perf_counter() - start) * 1000
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if not etag:
+                print(f"⚠️  {url}: pas d'ETag (lancer python clear_tile_cache.py)")
+                continue
+
+            start = time.perf_counter()
+            conditionnelle = client.get(url, headers={'If-None-Match': etag})
+            conditionnelle_ms = (time.perf_counter() - start) * 1000
+            par_date = client.get(url, headers={'If-Modified-Since': last_modified})
+
+            ok = conditionnelle.status_code == 304 and not conditionnelle.data and par_date.status_code == 304
+            print(f"{'✅' if ok else '❌'} {url}: {complet_ms:.1f} ms -> 304 en {conditionnelle_ms:.1f} ms")
+
+        # 2. Une écriture sur les incidents change l'ETag des endpoints qui les lisent
+        url = '/api/evenements?per_page=5'
+        etag = client.get(url).headers.get('ETag')
+        etag_gares = client.get('/api/gares?all=true').headers.get('ETag')
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE gpr.ge_evenement SET etat = etat WHERE id = (SELECT MIN(id) FROM gpr.ge_evenement)")
+        conn.commit()
+        cursor.close()
+        conn.close()
+        invalidate_caches('evenements')
+
+        apres = client.get(url, headers={'If-None-Match': etag})
+        gares = client.get('/api/gares?all=true', headers={'If-None-Match': etag_gares})
+        print(f"{'✅' if apres.status_code == 200 else '❌'} Incidents après écriture -> HTTP {apres.status_code}")
+        print(f"{'✅' if gares.status_code == 304 else '❌'} Gares inchangées -> HTTP {gares.status_code}")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_conditional_get()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test du pool de connexions PostgreSQL partagé (get_db_connection)
+"""
+
+import sys
+import os
+import threading
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_db_pool():
+    """Emprunter/rendre des connexions et afficher les métriques du pool"""
+
+    try:
+        from app import db_pool, get_db_connection
+
+        print("🔍 Test du pool de connexions PostgreSQL...")
+        print("=" * 50)
+
+        # 1. Emprunt simple et vérification du statement_timeout
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SHOW statement_timeout")
+        print(f"✅ Connexion empruntée (statement_timeout={cursor.fetchone()[0]})")
+        cursor.close()
+        conn.close()
+
+        # 2. La connexion rendue doit être réutilisée (pas de nouvelle connexion TCP)
+        ouvertes_avant = db_pool.stats()['ouvertes']
+        for _ in range(20):
+            conn = get_db_connection()
+            conn.close()
+        ouvertes_apres = db_pool.stats()['ouvertes']
+        if ouvertes_apres == ouvertes_avant:
+            print(f"✅ 20 emprunts successifs sur {ouvertes_apres} connexion(s) ouverte(s)")
+        else:
+            print(f"❌ Le pool a ouvert de nouvelles connexions: {ouvertes_avant} -> {ouvertes_apres}")
+
+        # 3. Emprunts concurrents (comme les appels parallèles de la carte)
+        erreurs = []
+
+        def worker():
+            try:
+                c = get_db_connection()
+                cur = c.cursor()
+                cur.execute("SELECT COUNT(*) FROM gpr.ref_types")
+                cur.fetchone()
+                cur.close()
+                c.close()
+            except Exception as e:
+                erreurs.append(str(e))
+
+        threads = [threading.Thread(target=worker) for _ in range(db_pool.maxconn * 2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        if erreurs:
+            print(f"❌ {len(erreurs)} erreurs en concurrence: {erreurs[0]}")
+        else:
+            print(f"✅ {len(threads)} requêtes concurrentes servies par {db_pool.maxconn} connexions max")
+
+        stats = db_pool.stats()
+        print(f"\n📊 Métriques: {stats['checkouts']} emprunts, {stats['timeouts']} timeouts")
+        print(f"   Attente moyenne: {stats['attente_ms']['moyenne']} ms (max {stats['attente_ms']['max']} ms)")
+        print(f"   Durée d'emprunt moyenne: {stats['emprunt_ms']['moyenne']} ms (max {stats['emprunt_ms']['max']} ms)")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_db_pool()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test des encodages de géométrie (?geom=wkt|geojson|polyline|binary|none) de /api/gares, /api/arcs et /api/evenements
+"""
+
+import sys
+import os
+import json
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_encodage_geometrie():
+    """Polyline de référence, lecture WKT, format binaire et négociation sur les endpoints"""
+
+    try:
+        import encodage_geometrie
+        from app import app
+
+        print("🔍 Test des encodages de géométrie...")
+        print("=" * 50)
+
+        # 1. Exemple de la documentation Google : (38.5, -120.2), (40.7, -120.95), (43.252, -126.453)
+        points = [[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]
+        chaine = encodage_geometrie.encoder_polyline(points)
+        print(f"{'✅' if chaine == '_p~iF~ps|U_ulLnnqC_mqNvxq`@' else '❌'} Polyline de référence: {chaine}")
+        decodes = encodage_geometrie.decoder_polyline(chaine)
+        ok = all(abs(a - b) < 1e-9 for p, q in zip(points, decodes) for a, b in zip(p, q))
+        print(f"{'✅' if ok else '❌'} Polyline décodée: {decodes}")
+
+        # 2. Lecture WKT et quantification
+        cas = {
+            'POINT(-7.589843 33.573109)': ('Point', [-7.589843, 33.573109]),
+            'SRID=4326;POINT (-7.5 33.5)': ('Point', [-7.5, 33.5]),
+            'LINESTRING(-7 33, -6.5 34)': ('LineString', [[-7.0, 33.0], [-6.5, 34.0]]),
+            'MULTILINESTRING((-7 33,-6 34),(-5 35, -4 36))': ('MultiLineString', [[[-7.0, 33.0], [-6.0, 34.0]], [[-5.0, 35.0], [-4.0, 36.0]]]),
+        }
+        for wkt, attendu in cas.items():
+            obtenu = encodage_geometrie.parse_wkt(wkt)
+            print(f"{'✅' if obtenu == attendu else '❌'} {wkt} -> {obtenu[0]}")
+        geojson = encodage_geometrie.encoder_geometrie('POINT(-7.589843 33.573109)', 'geojson', 3)
+        print(f"{'✅' if geojson == {'type': 'Point', 'coordinates': [-7.59, 33.573]} else '❌'} GeoJSON quantifié: {geojson}")
+
+        # 3. Format binaire : aller-retour, géométrie absente en NaN
+        elements = [{'id': 12, 'geometrie': 'POINT(-7.5 33.5)'}, {'id': 40, 'geometrie': None}]
+        ids, lons, lats = encodage_geometrie.decoder_points_binaire(encodage_geometrie.encoder_points_binaire(elements))
+        ok = ids.tolist() == [12, 40] and (lons[0], lats[0]) == (-7.5, 33.5) and lons[1] != lons[1]
+        print(f"{'✅' if ok else '❌'} Binaire: ids {ids.tolist()}, lon {lons.tolist()}, lat {lats.tolist()}")
+
+        # 4. Paramètres invalides
+        for args, binaire in [({'geom': 'kml'}, True), ({'geom': 'binary'}, False), ({'geom': 'geojson', 'precision': '9'}, True)]:
+            try:
+                encodage_geometrie.format_demande(args, binaire=binaire)
+                print(f"❌ {args} accepté")
+            except ValueError as e:
+                print(f"✅ {args} refusé: {e}")
+
+        # 5. Endpoints : même nombre d'éléments et mêmes positions quel que soit l'encodage
+        app.config['WTF_CSRF_ENABLED'] = False
+        client = app.test_client()
+        client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+        wkt = json.loads(client.get('/api/gares?all=true').data)['data']
+        positions = {g['id']: encodage_geometrie.parse_wkt(g['geometrie'])[1] for g in wkt if g['geometrie']}
+        for geom in ('geojson', 'polyline', 'none'):
+            data = json.loads(client.get(f'/api/gares?all=true&geom={geom}').data)
+            ok = data.get('format_geometrie') == geom and len(data['data']) == len(wkt)
+            if geom == 'geojson':
+                ok = ok and all(abs(g['geometrie']['coordinates'][0] - positions[g['id']][0]) < 1e-5
+                                for g in data['data'] if g['id'] in positions)
+            elif geom == 'polyline':
+                ok = ok and all(abs(encodage_geometrie.decoder_polyline(g['geometrie'])[0][1] - positions[g['id']][1]) < 1e-5
+                                for g in data['data'] if g['id'] in positions)
+            else:
+                ok = ok and all('geometrie' not in g for g in data['data'])
+            print(f"{'✅' if ok else '❌'} /api/gares geom={geom}: {len(data['data'])} gares")
+
+        response = client.get('/api/gares?all=true&geom=binary')
+        ids, lons, lats = encodage_geometrie.decoder_points_binaire(response.data)
+        ok = (response.mimetype == encodage_geometrie.BINAIRE_MIMETYPE and len(ids) == len(wkt)
+              and all(abs(lons[i] - positions[g][0]) < 1e-4 for i, g in enumerate(ids.tolist()) if g in positions))
+        print(f"{'✅' if ok else '❌'} /api/gares geom=binary: {len(ids)} points, {len(response.data)} octets")
+
+        arcs = json.loads(client.get('/api/arcs?geom=polyline').data)['data']
+        ok = all(isinstance(arc['geometrie'], list) for arc in arcs if arc.get('geometrie'))
+        print(f"{'✅' if ok else '❌'} /api/arcs geom=polyline: {len(arcs)} axes")
+        wkt_arcs = json.loads(client.get('/api/arcs').data)['data']
+        ok = all(isinstance(arc['geometrie'], str) for arc in wkt_arcs if arc.get('geometrie'))
+        print(f"{'✅' if ok else '❌'} /api/arcs : WKT conservé dans le cache après un encodage")
+        response = client.get('/api/arcs?geom=binary')
+        print(f"{'✅' if response.status_code == 400 else '❌'} /api/arcs geom=binary: HTTP {response.status_code}")
+
+        data = json.loads(client.get('/api/evenements?per_page=20&geom=geojson').data)
+        ok = all(e['geometrie'] is None or e['geometrie']['type'] == 'Point' for e in data['data'])
+        print(f"{'✅' if ok else '❌'} /api/evenements geom=geojson: {len(data['data'])} incidents")
+        response = client.get('/api/evenements?per_page=20&geom=binary')
+        ids = encodage_geometrie.decoder_points_binaire(response.data)[0]
+        print(f"{'✅' if len(ids) == len(data['data']) else '❌'} /api/evenements geom=binary: {len(ids)} points, "
+              f"total {response.headers.get('X-Total-Count')}")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_encodage_geometrie()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test de la pagination par curseur et du mode NDJSON de /api/evenements
+"""
+
+import sys
+import os
+import requests
+import json
+from datetime import date, datetime, time
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+BASE_URL = "http://localhost:5000"
+
+def parcourir_par_curseur(sort, per_page=40):
+    """Parcourir toutes les pages en suivant next_cursor"""
+    ids = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {'per_page': per_page, 'sort': sort}
+        if cursor:
+            params['cursor'] = cursor
+        data = requests.get(f"{BASE_URL}/api/evenements", params=params).json()
+        if not data.get('success'):
+            raise Exception(data.get('error'))
+        ids.extend(evt['id'] for evt in data['data'])
+        pages += 1
+        cursor = data['pagination']['next_cursor']
+        if not cursor:
+            return ids, pages, data['pagination']['total']
+
+def test_evenements_pagination():
+    """Vérifier que le parcours par curseur couvre chaque incident exactement une fois"""
+
+    try:
+        print("🔍 Test de la pagination des incidents...")
+        print("=" * 50)
+
+        for sort in ['date_desc', 'date_asc', 'status', 'type']:
+            ids, pages, total = parcourir_par_curseur(sort)
+            if len(ids) == total and len(set(ids)) == total:
+                print(f"✅ Tri {sort}: {total} incidents en {pages} pages, sans doublon")
+            else:
+                print(f"❌ Tri {sort}: {len(ids)} lignes ({len(set(ids))} distinctes) pour un total de {total}")
+
+            # La page 3 par OFFSET doit correspondre à la page 3 par curseur
+            data = requests.get(f"{BASE_URL}/api/evenements", params={'per_page': 40, 'page': 3, 'sort': sort}).json()
+            if [evt['id'] for evt in data['data']] == ids[80:120]:
+                print(f"✅ Tri {sort}: page 3 identique par OFFSET et par curseur")
+            else:
+                print(f"❌ Tri {sort}: page 3 différente par OFFSET et par curseur")
+
+        # Curseur invalide
+        response = requests.get(f"{BASE_URL}/api/evenements", params={'cursor': 'invalide'})
+        print(f"{'✅' if response.status_code == 400 else '❌'} Curseur invalide: HTTP {response.status_code}")
+
+        # Mode streaming NDJSON
+        response = requests.get(f"{BASE_URL}/api/evenements", params={'format': 'ndjson'}, stream=True)
+        lignes = [json.loads(ligne) for ligne in response.iter_lines() if ligne]
+        print(f"✅ NDJSON ({response.headers.get('Content-Type')}): {len(lignes)} incidents reçus")
+
+    except requests.exceptions.ConnectionError:
+        print("❌ Serveur non accessible sur http://localhost:5000")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+def test_curseur_valeurs_temporelles():
+    """Un curseur rend la valeur de tri avec son type : date_debut DATE, TIMESTAMP ou heure"""
+
+    try:
+        from app import decode_cursor, encode_cursor, get_seek_condition
+
+        print("🔍 Test des curseurs sur des valeurs de tri date / datetime / time...")
+        print("=" * 50)
+
+        for value in [date(2024, 3, 15), datetime(2024, 3, 15, 8, 30, 12), time(8, 30), 'Ouvert', None]:
+            token = encode_cursor('date_desc', value, 42)
+            decoded = decode_cursor(token, 'date_desc')
+            ok = decoded == (value, 42) and type(decoded[0]) is type(value)
+            print(f"{'✅' if ok else '❌'} {type(value).__name__} {value!r}: {decoded[0]!r}")
+
+        # Colonne date_debut de type DATE (recreate_tables_with_real_structure.py) : page suivante valide
+        value, row_id = decode_cursor(encode_cursor('date_asc', date(2024, 3, 15), 7), 'date_asc')
+        condition, params = get_seek_condition('date_asc', value, row_id)
+        print(f"{'✅' if params == [date(2024, 3, 15), 7] else '❌'} Condition DATE: {condition} {params}")
+
+        # Curseur de l'ancien format ('d' : datetime ISO) toujours accepté
+        import base64
+        ancien = base64.urlsafe_b64encode(json.dumps({'s': 'date_desc', 'i': 3, 'd': '2024-03-15T08:30:00'}).encode()).decode()
+        decoded = decode_cursor(ancien.rstrip('='), 'date_desc')
+        print(f"{'✅' if decoded == (datetime(2024, 3, 15, 8, 30), 3) else '❌'} Ancien curseur: {decoded}")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_curseur_valeurs_temporelles()
+    test_evenements_pagination()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test des exports en flux /api/export/{gares|arcs|evenements}.{geojson|ndjson}
+"""
+
+import sys
+import os
+import json
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_export_couches():
+    """FeatureCollections complètes, NDJSON équivalent, filtres et envoi par paquets"""
+
+    try:
+        import app as application
+        from app import app
+
+        print("🔍 Test des exports GeoJSON / NDJSON...")
+        print("=" * 50)
+
+        client = app.test_client()
+        client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+        # 1. Chaque couche : FeatureCollection valide, autant de Features qu'en NDJSON
+        totaux = {}
+        for couche in ('gares', 'arcs', 'evenements'):
+            response = client.get(f'/api/export/{couche}.geojson')
+            collection = json.loads(response.data)
+            features = collection['features']
+            ok = (response.mimetype == 'application/geo+json' and collection['type'] == 'FeatureCollection'
+                  and 'attachment' in response.headers.get('Content-Disposition', ''))
+            sans_geometrie = sum(1 for f in features if f['geometry'] is None)
+            print(f"{'✅' if ok else '❌'} {couche}.geojson: {len(features)} features ({sans_geometrie} sans géométrie)")
+
+            response = client.get(f'/api/export/{couche}.ndjson')
+            lignes = [json.loads(ligne) for ligne in response.data.splitlines() if ligne.strip()]
+            ok = response.mimetype == 'application/x-ndjson' and [f['id'] for f in lignes] == [f['id'] for f in features]
+            print(f"{'✅' if ok else '❌'} {couche}.ndjson: {len(lignes)} lignes, mêmes features")
+            totaux[couche] = features
+
+        # 2. Filtres de l'endpoint de chaque couche
+        gares = json.loads(client.get('/api/gares?all=true').data)['data']
+        region = next((g['region'] for g in gares if g['region']), None)
+        if region:
+            features = json.loads(client.get(f'/api/export/gares.geojson?region={region}').data)['features']
+            attendu = sum(1 for g in gares if g['region'] == region)
+            print(f"{'✅' if len(features) == attendu else '❌'} Filtre region={region}: {len(features)}/{attendu} gares")
+        axe = totaux['arcs'][0]['properties']['axe'] if totaux['arcs'] else None
+        if axe:
+            features = json.loads(client.get(f'/api/export/arcs.geojson?axe={axe}').data)['features']
+            ok = features and all(f['properties']['axe'] == axe for f in features)
+            print(f"{'✅' if ok else '❌'} Filtre axe={axe}: {len(features)} segments")
+        type_id = totaux['evenements'][0]['properties']['type_id'] if totaux['evenements'] else None
+        if type_id:
+            total = json.loads(client.get(f'/api/evenements?per_page=1&type_id={type_id}').data)['pagination']['total']
+            features = json.loads(client.get(f'/api/export/evenements.geojson?type_id={type_id}').data)['features']
+            print(f"{'✅' if len(features) == total else '❌'} Filtre type_id={type_id}: {len(features)}/{total} incidents")
+
+        # 3. Précision des coordonnées
+        features = json.loads(client.get('/api/export/gares.geojson?precision=2').data)['features']
+        ok = all(round(v, 2) == v for f in features if f['geometry'] for v in f['geometry']['coordinates'])
+        print(f"{'✅' if ok else '❌'} precision=2 appliquée")
+
+        # 4. Envoi par paquets de EXPORT_ITERSIZE lignes (mémoire bornée)
+        itersize = application.EXPORT_ITERSIZE
+        application.EXPORT_ITERSIZE = 50
+        try:
+            response = client.get('/api/export/evenements.ndjson')
+            paquets = [paquet for paquet in response.response if paquet.strip()]
+        finally:
+            application.EXPORT_ITERSIZE = itersize
+        attendu = -(-len(totaux['evenements']) // 50)
+        print(f"{'✅' if len(paquets) == attendu else '❌'} {len(paquets)} paquets envoyés pour {len(totaux['evenements'])} incidents")
+
+        # 5. Erreurs
+        for url, statut in [('/api/export/lignes.geojson', 404), ('/api/export/gares.kml', 404),
+                            ('/api/export/gares.geojson?precision=9', 400)]:
+            response = client.get(url)
+            print(f"{'✅' if response.status_code == statut else '❌'} {url}: HTTP {response.status_code}")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_export_couches()
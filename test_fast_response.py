@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test de la couche de réponse : JSON rapide et compression gzip/brotli négociée
+"""
+
+import sys
+import os
+import gzip
+import json
+import datetime
+import decimal
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_fast_response():
+    """Types natifs, négociation Accept-Encoding, seuil de taille et réponses streamées"""
+
+    try:
+        import fast_response
+        from app import app
+
+        print("🔍 Test de la couche de réponse...")
+        print("=" * 50)
+
+        # 1. Dates, heures et Decimal sérialisés sans conversion dans les vues
+        valeur = {'d': datetime.datetime(2024, 3, 1, 8, 30), 'h': datetime.time(8, 30, 5),
+                  'j': datetime.date(2024, 3, 1), 'pk': decimal.Decimal('12.500'), 'nom': 'Fès'}
+        attendu = {'d': '2024-03-01T08:30:00', 'h': '08:30:05', 'j': '2024-03-01', 'pk': 12.5, 'nom': 'Fès'}
+        obtenu = json.loads(fast_response.dumps_bytes(valeur))
+        print(f"{'✅' if obtenu == attendu else '❌'} JSON {fast_response.JSON_ENGINE}: {obtenu}")
+
+        # 2. Négociation de l'encodage
+        cas = {'gzip, deflate, br': 'br' if fast_response.BROTLI_AVAILABLE else 'gzip',
+               'gzip;q=0': None, 'identity': None, '*': fast_response.COMPRESS_ALGORITHMS[0] if fast_response.BROTLI_AVAILABLE else 'gzip'}
+        for entete, algo in cas.items():
+            choisi = fast_response.choisir_encodage(entete)
+            print(f"{'✅' if choisi == algo else '❌'} Accept-Encoding '{entete}' -> {choisi}")
+
+        app.config['WTF_CSRF_ENABLED'] = False
+        client = app.test_client()
+        client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+        # 3. Réponse JSON volumineuse : compressée, identique une fois décompressée
+        url = '/api/gares?all=true'
+        brute = client.get(url, headers={'Accept-Encoding': 'identity'})
+        compressee = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        ok = (compressee.headers.get('Content-Encoding') == 'gzip'
+              and gzip.decompress(compressee.get_data()) == brute.get_data()
+              and 'Accept-Encoding' in compressee.headers.get('Vary', ''))
+        print(f"{'✅' if ok else '❌'} {url}: {len(brute.get_data()):,} -> {len(compressee.get_data()):,} octets (gzip)")
+
+        # 4. Petite réponse : sous le seuil, envoyée telle quelle
+        petite = client.get('/api/gares/nearest?lon=-6.8&lat=34&limit=1', headers={'Accept-Encoding': 'gzip'})
+        ok = 'Content-Encoding' not in petite.headers and len(petite.get_data()) < fast_response.COMPRESS_MIN_SIZE
+        print(f"{'✅' if ok else '❌'} Réponse de {len(petite.get_data())} octets non compressée (seuil {fast_response.COMPRESS_MIN_SIZE})")
+        erreur = client.get('/page-inexistante', headers={'Accept-Encoding': 'gzip'})
+        ok = erreur.status_code == 404 and 'Content-Encoding' not in erreur.headers
+        print(f"{'✅' if ok else '❌'} Page d'erreur de {len(erreur.get_data())} octets non compressée (HTTP {erreur.status_code})")
+
+        # 5. Flux NDJSON compressé à la volée
+        flux = client.get('/api/evenements?format=ndjson', headers={'Accept-Encoding': 'gzip'})
+        lignes = gzip.decompress(flux.get_data()).decode('utf-8').splitlines()
+        ok = flux.headers.get('Content-Encoding') == 'gzip' and all(json.loads(l).get('id') for l in lignes)
+        print(f"{'✅' if ok else '❌'} NDJSON compressé: {len(lignes)} incidents")
+
+        # 6. Revalidation d'une réponse compressée (ETag faible)
+        bundle = client.get('/api/reference/bundle', headers={'Accept-Encoding': 'gzip'})
+        revalidation = client.get('/api/reference/bundle', headers={'Accept-Encoding': 'gzip', 'If-None-Match': bundle.headers['ETag']})
+        print(f"{'✅' if revalidation.status_code == 304 else '❌'} Bundle compressé revalidé -> HTTP {revalidation.status_code}")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_fast_response()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test de la recherche plein texte des incidents (search_mode=fulltext)
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_fulltext_search():
+    """Trigger de mise à jour, classement par pertinence et extraits ts_headline"""
+
+    try:
+        from app import app, get_db_connection, fulltext_disponible
+
+        print("🔍 Test de la recherche plein texte...")
+        print("=" * 50)
+
+        if not fulltext_disponible():
+            print("⚠️  Colonne recherche_tsv absente (lancer python migrate_fulltext_search.py)")
+            return
+
+        # 1. Le trigger calcule recherche_tsv à l'insertion et à la modification du récit
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO gpr.ge_evenement (id, resume, etat)
+            VALUES ((SELECT MAX(id) + 1 FROM gpr.ge_evenement), 'Choc à la voie signalé par le CTR', 'Ouvert')
+            RETURNING id
+        """)
+        evenement_id = cursor.fetchone()[0]
+        cursor.execute("SELECT recherche_tsv @@ websearch_to_tsquery('gpr.francais', 'chocs voies') FROM gpr.ge_evenement WHERE id = %s", (evenement_id,))
+        insere = cursor.fetchone()[0]
+        cursor.execute("UPDATE gpr.ge_evenement SET resume = 'Déraillement en gare' WHERE id = %s", (evenement_id,))
+        cursor.execute("SELECT recherche_tsv @@ websearch_to_tsquery('gpr.francais', 'déraillement') FROM gpr.ge_evenement WHERE id = %s", (evenement_id,))
+        modifie = cursor.fetchone()[0]
+        conn.rollback()
+        cursor.close()
+        conn.close()
+        print(f"{'✅' if insere and modifie else '❌'} Trigger: insertion ({insere}) et modification ({modifie}) indexées")
+
+        # 2. Résultats classés par pertinence, termes en surbrillance
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.get('/api/evenements', query_string={'search': 'choc à la voie', 'search_mode': 'fulltext', 'per_page': 10})
+        duree = (time.perf_counter() - start) * 1000
+        result = response.get_json()
+        data = result.get('data', [])
+        scores = [d.get('pertinence') for d in data]
+        ok = result.get('search_mode') == 'fulltext' and scores == sorted(scores, reverse=True)
+        print(f"{'✅' if ok else '❌'} « choc à la voie »: {result.get('pagination', {}).get('total')} incidents en {duree:.1f} ms")
+        if data:
+            surbrillance = '<mark>' in (data[0].get('extrait_recherche') or '')
+            print(f"{'✅' if surbrillance else '❌'} Extrait: {data[0].get('extrait_recherche', '')[:120]}")
+
+        # 3. Tri explicite conservé, pagination par curseur disponible
+        response = client.get('/api/evenements', query_string={'search': 'train', 'search_mode': 'fulltext', 'per_page': 2, 'sort': 'date_desc'})
+        pagination = response.get_json().get('pagination', {})
+        ok = not pagination.get('has_next') or pagination.get('next_cursor')
+        print(f"{'✅' if ok else '❌'} Tri par date en mode plein texte ({pagination.get('total')} incidents)")
+
+        # 4. Le texte des récits est échappé dans les extraits
+        response = client.get('/api/evenements', query_string={'search': 'train', 'search_mode': 'fulltext', 'per_page': 50})
+        extraits = [d.get('extrait_recherche') or '' for d in response.get_json().get('data', [])]
+        balises = all(e.replace('<mark>', '').replace('</mark>', '').count('<') == 0 for e in extraits)
+        print(f"{'✅' if balises else '❌'} {len(extraits)} extraits sans autre balise que <mark>")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_fulltext_search()
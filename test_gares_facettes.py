@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test des facettes des gares (/api/gares/filters, /api/gares/stats)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_gares_facettes():
+    """Comptes cohérents avec /api/gares, facettes indépendantes de leur propre filtre, cache"""
+
+    try:
+        from app import app, gares_cache, invalidate_caches
+
+        print("🔍 Test des facettes des gares...")
+        print("=" * 50)
+
+        client = app.test_client()
+
+        # 1. Statistiques globales = total de /api/gares
+        invalidate_caches('gares')
+        stats = client.get('/api/gares/stats').get_json()
+        total = client.get('/api/gares?per_page=1').get_json()['pagination']['total']
+        data = stats.get('data', {})
+        ok = data.get('total_gares') == total and data['active_gares'] + data['passive_gares'] == total
+        print(f"{'✅' if ok else '❌'} Stats: {data} (cache {stats.get('cache')})")
+
+        # 2. Même agrégation pour les filtres sans paramètre : servie par le cache
+        result = client.get('/api/gares/filters').get_json()
+        facettes = result['data']['facettes']
+        print(f"{'✅' if result.get('cache') == 'hit' else '❌'} /api/gares/filters après /api/gares/stats: cache {result.get('cache')}")
+        print(f"{'✅' if result['data']['regions'] == [o['valeur'] for o in facettes['regions']] else '❌'} "
+              f"Listes de valeurs: { {cle: len(options) for cle, options in facettes.items()} }")
+
+        # 3. Avec un filtre : le compte de chaque valeur correspond à /api/gares avec les mêmes filtres
+        if facettes['regions']:
+            region = facettes['regions'][0]['valeur']
+            result = client.get('/api/gares/filters', query_string={'region': region}).get_json()['data']
+            print(f"{'✅' if result['stats']['total_gares'] == facettes['regions'][0]['count'] else '❌'} "
+                  f"region={region}: {result['stats']['total_gares']} gare(s)")
+            # La facette région ignore son propre filtre : toutes les régions restent proposées
+            print(f"{'✅' if len(result['facettes']['regions']) == len(facettes['regions']) else '❌'} Facette région non restreinte par region=")
+            for option in result['facettes']['etats']:
+                attendu = client.get('/api/gares', query_string={'region': region, 'etat': option['valeur'], 'per_page': 1}
+                                     ).get_json()['pagination']['total']
+                print(f"{'✅' if option['count'] == attendu else '❌'} etat={option['valeur']}: {option['count']} (attendu {attendu})")
+
+        # 4. Recherche libre (une requête par frappe) jamais mise en cache
+        entrees = gares_cache.stats()['entrees']
+        for prefixe in ('c', 'ca', 'cas'):
+            client.get('/api/gares/filters', query_string={'search': prefixe})
+        print(f"{'✅' if gares_cache.stats()['entrees'] == entrees else '❌'} search= non mis en cache "
+              f"({gares_cache.stats()['entrees']} entrées)")
+
+        # 5. Invalidation après écriture
+        invalidate_caches('gares')
+        print(f"{'✅' if gares_cache.stats()['entrees'] == 0 else '❌'} Cache vidé par invalidate_caches('gares')")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_gares_facettes()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test des données de carte par fenêtre (/api/map/features)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_map_features():
+    """Vérifier l'emprise, le regroupement des incidents et la simplification des axes"""
+
+    try:
+        import numpy as np
+        from app import app, parse_bbox, simplifier_ligne, get_db_connection, MAP_CLUSTER_MAX_ZOOM
+
+        print("🔍 Test des données de carte par fenêtre...")
+        print("=" * 50)
+
+        # 1. Lecture de l'emprise
+        print(f"{'✅' if parse_bbox('-10,27,-1,37') == (-10.0, 27.0, -1.0, 37.0) else '❌'} bbox lue")
+        try:
+            parse_bbox('-1,27,-10,37')
+            print("❌ bbox inversée acceptée")
+        except ValueError:
+            print("✅ bbox inversée refusée")
+
+        # 2. Douglas-Peucker : les points alignés disparaissent, le sommet reste
+        ligne = np.array([[0, 0], [1, 0.01], [2, 0], [3, 5], [4, 0]], dtype=float)
+        indices = simplifier_ligne(ligne, 0.5).tolist()
+        print(f"{'✅' if indices == [0, 2, 3, 4] else '❌'} Simplification: {indices}")
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM gpr.ge_evenement
+            WHERE position_lon BETWEEN -10 AND -1 AND position_lat BETWEEN 27 AND 37
+        """)
+        positionnes = cursor.fetchone()[0]
+        cursor.close()
+        conn.close()
+
+        client = app.test_client()
+
+        # 3. Petit zoom : incidents isolés + regroupements = tous les incidents positionnés
+        data = client.get('/api/map/features?bbox=-10,27,-1,37&zoom=6').get_json()['data']
+        total = len(data['incidents']) + sum(c['count'] for c in data['clusters'])
+        print(f"{'✅' if total == positionnes else '❌'} Zoom 6: {len(data['clusters'])} regroupements, "
+              f"{len(data['incidents'])} isolés ({total}/{positionnes} incidents)")
+        print(f"   {len(data['gares'])} gares, {len(data['arcs'])} arcs "
+              f"({sum(len(a['coordinates']) for a in data['arcs'])} sommets)")
+
+        # 4. Grand zoom : incidents individuels, plus de regroupement
+        zoom = MAP_CLUSTER_MAX_ZOOM + 1
+        detail = client.get(f'/api/map/features?bbox=-10,27,-1,37&zoom={zoom}').get_json()['data']
+        ok = not detail['clusters'] and (len(detail['incidents']) == positionnes or detail['truncated'])
+        print(f"{'✅' if ok else '❌'} Zoom {zoom}: {len(detail['incidents'])} incidents individuels, "
+              f"{sum(len(a['coordinates']) for a in detail['arcs'])} sommets d'arcs")
+
+        # 5. Paramètre invalide
+        response = client.get('/api/map/features?bbox=abc')
+        print(f"{'✅' if response.status_code == 400 else '❌'} bbox invalide -> HTTP {response.status_code}")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_map_features()
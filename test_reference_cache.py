@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test du cache des référentiels et de /api/reference/bundle
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_reference_cache():
+    """Bundle complet, réponse 304 sur ETag identique, rechargement après écriture"""
+
+    try:
+        from app import app, get_db_connection, get_references, invalidate_caches, reference_cache
+
+        print("🔍 Test du cache des référentiels...")
+        print("=" * 50)
+
+        app.config['WTF_CSRF_ENABLED'] = False
+        client = app.test_client()
+        client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+        # 1. Bundle : types avec leurs sous-types
+        response = client.get('/api/reference/bundle')
+        data = response.get_json()['data']
+        etag = response.headers.get('ETag')
+        sous_types = sum(len(t['sous_types']) for t in data['types'])
+        print(f"✅ Bundle: {len(data['types'])} types ({sous_types} sous-types), {len(data['sources'])} sources, "
+              f"{len(data['systemes'])} systèmes, {len(data['entites'])} entités")
+        print(f"   ETag {etag}, {len(response.data)} octets")
+
+        # 2. Requête conditionnelle : 304 sans corps
+        response = client.get('/api/reference/bundle', headers={'If-None-Match': etag})
+        print(f"{'✅' if response.status_code == 304 and not response.data else '❌'} If-None-Match -> HTTP {response.status_code}")
+
+        # 3. Les endpoints existants lisent le même cache
+        hits = reference_cache.hits
+        client.get('/api/reference/types')
+        client.get('/api/evenements/sources')
+        client.get('/api/types-incidents')
+        print(f"{'✅' if reference_cache.hits - hits == 3 else '❌'} 3 endpoints servis par le cache "
+              f"({reference_cache.hits - hits} hits)")
+
+        # 4. Une écriture sur une table ref_* change la version, donc le bundle est rechargé
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, intitule FROM gpr.ref_sources ORDER BY id LIMIT 1")
+        source_id, intitule = cursor.fetchone()
+        cursor.execute("UPDATE gpr.ref_sources SET intitule = intitule || ' (test)' WHERE id = %s", (source_id,))
+        conn.commit()
+        invalidate_caches('references')
+        with app.app_context():
+            recharge = any(s['intitule'].endswith(' (test)') for s in get_references()['sources'])
+        response = client.get('/api/reference/bundle', headers={'If-None-Match': etag})
+        print(f"{'✅' if recharge and response.status_code == 200 else '❌'} Rechargé après écriture "
+              f"(HTTP {response.status_code}, nouvel ETag {response.headers.get('ETag')})")
+
+        cursor.execute("UPDATE gpr.ref_sources SET intitule = %s WHERE id = %s", (intitule, source_id))
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_reference_cache()
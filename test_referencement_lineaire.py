@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test du référencement linéaire (referencement_lineaire.py, /api/network/positions, /api/network/locate)
+"""
+
+import sys
+import os
+import math
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def segment(arc_id, pk_debut, pk_fin, coords):
+    return {'id': arc_id, 'pk_debut': pk_debut, 'pk_fin': pk_fin, 'plod': None, 'plof': None,
+            'absd': 0, 'absf': 0, 'coords': coords}
+
+def test_referencement_lineaire():
+    """Interpolation, géométrie inversée, lacune, tolérance ; PK des gares et endpoint sur la base"""
+
+    try:
+        from referencement_lineaire import ReferencementLineaire, format_pk, parse_pk
+        from vector_tiles import mercator_to_lonlat
+
+        print("🔍 Test du référencement linéaire...")
+        print("=" * 50)
+
+        # Axe A : PK 0 -> 1 puis 1 -> 2 (deuxième segment saisi à l'envers), lacune, PK 10 -> 11
+        referencement = ReferencementLineaire({
+            'A': [segment(1, 0, 1, [(0, 0), (400, 0), (1000, 0)]),
+                  segment(2, 1, 2, [(2000, 0), (1000, 0)]),
+                  segment(3, 10, 11, [(9000, 0), (10000, 0)])],
+            'B': [segment(4, 5, 6, [(0, 5000), (0, 6000)])],
+        }, tolerance_km=0.5)
+        x_attendu, _ = mercator_to_lonlat([250, 1250, 2000, 9000], [0, 0, 0, 0])
+
+        resultat = referencement.localiser(['A', 'a', 'A', 'A', 'A', 'C', 'B'], [0.25, 1.25, 3.0, 9.8, 7.0, 1, None])
+        lons = resultat['lon']
+
+        # 1. Interpolation entre les sommets et géométrie inversée
+        ok = abs(lons[0] - x_attendu[0]) < 1e-9 and abs(lons[1] - x_attendu[1]) < 1e-9
+        print(f"{'✅' if ok else '❌'} PK 0.25 et 1.25 (segment inversé): arcs {resultat['arc_id'][:2].tolist()}")
+
+        # 2. Au-delà d'un segment : rattaché à l'extrémité la plus proche dans la tolérance, sinon non résolu
+        ok = math.isnan(lons[2]) and abs(lons[3] - x_attendu[3]) < 1e-9 and math.isnan(lons[4])
+        print(f"{'✅' if ok else '❌'} Lacune et tolérance: écarts {resultat['ecart_km'][2:5].tolist()}")
+
+        # 3. Axe inconnu, PK absent
+        ok = math.isnan(lons[5]) and math.isnan(lons[6]) and resultat['arc_id'][5] == -1
+        print(f"{'✅' if ok else '❌'} Axe inconnu et PK absent non résolus")
+        print(f"{'✅' if referencement.etendue('A') == (0.0, 11.0) else '❌'} Étendue de A: {referencement.etendue('A')}")
+
+        # Embranchement : segment [0, 10] et branche [2, 3] sur le même axe, le PK 5 reste sur le premier
+        embranchement = ReferencementLineaire({
+            'E': [segment(1, 0, 10, [(0, 0), (10000, 0)]),
+                  segment(2, 2, 3, [(2000, 0), (2000, 1000)]),
+                  segment(3, 14, 15, [(14000, 0), (15000, 0)])],
+        }, tolerance_km=5)
+        resultat = embranchement.localiser(['E', 'E', 'E', 'E'], [5.0, 2.5, 11.0, 13.5])
+        ok = (resultat['arc_id'].tolist() == [1, 2, 1, 3] and resultat['ecart_km'][0] == 0.0
+              and resultat['ecart_km'][1] == 0.0 and resultat['ecart_km'][2] == 1.0 and resultat['ecart_km'][3] == 0.5)
+        print(f"{'✅' if ok else '❌'} Embranchement: arcs {resultat['arc_id'].tolist()}, écarts {resultat['ecart_km'].tolist()}")
+        print(f"{'✅' if parse_pk('245+400') == 245.4 else '❌'} parse_pk('245+400') = {parse_pk('245+400')}")
+        print(f"{'✅' if format_pk(245.4) == '245+400' else '❌'} format_pk(245.4) = {format_pk(245.4)}")
+
+        # 4. Sens inverse : projection sur la voie la plus proche, PK au point accroché
+        projection = referencement.projeter([250, 1250, 9500, 20000], [30, -40, 0, 0], distance_max_m=100)
+        ok = projection['pk'][0] == 0.25 and abs(projection['pk'][1] - 1.25) < 1e-9 and abs(projection['pk'][2] - 10.5) < 1e-9
+        print(f"{'✅' if ok else '❌'} PK des points projetés: {projection['pk'][:3].tolist()}")
+        ok = abs(projection['distance_m'][0] - 30) < 1e-6 and projection['y'][1] == 0 and projection['axe'][3] == -1
+        print(f"{'✅' if ok else '❌'} Distance à la voie, point accroché, point trop loin non résolu")
+        projection = referencement.projeter([100], [4000], distance_max_m=5000)
+        print(f"{'✅' if projection['arc_id'][0] == 4 else '❌'} Voie la plus proche au-delà d'une cellule: arc {projection['arc_id'][0]}")
+
+        # 5. Sur la base : le PK (distance) de chaque gare la place sur son axe
+        from app import app, get_db_connection, load_gares_index
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        gares_index = load_gares_index(cursor)
+        cursor.close()
+        conn.close()
+
+        gares = [g for g in gares_index['gares'].values() if g['pk'] is not None and g['axe']]
+        resultat = gares_index['referencement'].localiser([g['axe'] for g in gares], [g['pk'] for g in gares])
+        ecarts = sorted(math.hypot((lon - g['lon']) * 111 * math.cos(math.radians(g['lat'])), (lat - g['lat']) * 111)
+                        for g, lon, lat in zip(gares, resultat['lon'], resultat['lat']) if not math.isnan(lon))
+        if ecarts:
+            median = ecarts[len(ecarts) // 2]
+            print(f"{'✅' if median < 1 else '⚠️ '} {len(ecarts)}/{len(gares)} gares placées par leur PK, "
+                  f"écart médian {median:.3f} km")
+
+        # 6. Endpoints : un lot de PK en POST, points WGS84 en GET et POST, axe des gares
+        client = app.test_client()
+        print(f"{'✅' if client.get('/api/network/positions').status_code == 400 else '❌'} Paramètres manquants -> 400")
+        if gares:
+            reponse = client.post('/api/network/positions', json={'points': [
+                {'axe': gares[0]['axe'], 'pk': gares[0]['pk']}, {'axe': 'INCONNU', 'pk': '12+500'}]})
+            data = reponse.get_json()
+            ok = reponse.status_code == 200 and data['total'] == 2 and data['data'][1]['lat'] is None
+            print(f"{'✅' if ok else '❌'} POST /api/network/positions: {data.get('resolus')}/{data.get('total')} résolus")
+
+            reponse = client.get(f"/api/network/locate?lat={gares[0]['lat']}&lng={gares[0]['lon']}")
+            voie = reponse.get_json()['data'][0]['voie']
+            print(f"{'✅' if voie else '❌'} GET /api/network/locate: {voie}")
+            reponse = client.post('/api/network/locate', json={'points': [{'lat': g['lat'], 'lng': g['lon']} for g in gares]})
+            data = reponse.get_json()
+            print(f"{'✅' if data['resolus'] > 0 else '❌'} POST /api/network/locate: {data['resolus']}/{data['total']} gares sur la voie")
+        print(f"{'✅' if client.get('/api/network/locate?lat=abc&lng=1').status_code == 400 else '❌'} Coordonnées invalides -> 400")
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM gpr.gpd_gares_ref WHERE geometrie IS NOT NULL ORDER BY id LIMIT 1")
+        gare_id = cursor.fetchone()[0]
+        cursor.close()
+        conn.close()
+        axe_info = client.get(f'/api/gares/{gare_id}/details').get_json()['data']['axe_info']
+        print(f"{'✅' if axe_info and axe_info.get('pk_texte') else '❌'} axe_info de la gare {gare_id}: {axe_info}")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_referencement_lineaire()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test du graphe du réseau ferré (reseau_ferre.py, /api/network/path, /api/arcs-multilines)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_reseau_ferre():
+    """Jonction en T, composantes, recherche de gare ; endpoints sur la base"""
+
+    try:
+        from reseau_ferre import ReseauFerre
+
+        print("🔍 Test du graphe du réseau ferré...")
+        print("=" * 50)
+
+        # Réseau synthétique : B part du milieu de A (jonction en T), C est isolé
+        segments = [
+            {'id': 1, 'nom_axe': 'A', 'pk_debut': 0, 'coords': [(0, 0), (1000, 0)]},
+            {'id': 2, 'nom_axe': 'B', 'pk_debut': 0, 'coords': [(500, 0), (500, 800)]},
+            {'id': 3, 'nom_axe': 'C', 'pk_debut': 0, 'coords': [(5000, 5000), (6000, 5000)]},
+        ]
+        gares = [
+            {'id': 10, 'code_gare': 'G.UN', 'nom': 'Gare Un', 'x': 0, 'y': 10},
+            {'id': 11, 'code_gare': 'G.DEUX', 'nom': 'Gare Deux', 'x': 500, 'y': 800},
+            {'id': 12, 'code_gare': 'G.TROIS', 'nom': 'Gare Trois', 'x': 5500, 'y': 5000},
+        ]
+        reseau = ReseauFerre(segments, gares)
+
+        # 1. Recherche de gare par id, code ou nom
+        trouvees = {reseau.trouver_gare(cle)['id'] for cle in ('10', 'g.un', 'gare un')}
+        print(f"{'✅' if trouvees == {10} else '❌'} Gare trouvée par id, code et nom: {trouvees}")
+        print(f"{'✅' if reseau.trouver_gare('INCONNUE') is None else '❌'} Gare inconnue -> None")
+        homonymes = ReseauFerre(segments, gares + [{'id': 13, 'code_gare': 'G.QUATRE', 'nom': 'Gare Un', 'x': 1000, 'y': 0}])
+        candidats = sorted(gare['id'] for gare in homonymes.candidats_gare('gare un'))
+        ok = candidats == [10, 13] and homonymes.trouver_gare('gare un') is None and homonymes.trouver_gare('13')['id'] == 13
+        print(f"{'✅' if ok else '❌'} Nom porté par plusieurs gares -> ambigu: {candidats}")
+
+        # 2. Plus court chemin à travers la jonction en T : 500 m sur A puis 800 m sur B
+        chemin = reseau.chemin(reseau.trouver_gare('G.UN'), reseau.trouver_gare('G.DEUX'))
+        ok = chemin is not None and abs(chemin['distance_m'] - 1300) < 1 and [a for a, _ in chemin['axes']] == ['A', 'B']
+        print(f"{'✅' if ok else '❌'} Chemin G.UN -> G.DEUX: {chemin and round(chemin['distance_m'])} m, "
+              f"axes {chemin and chemin['axes']}")
+
+        # 3. Composantes : pas de chemin vers C, lignes [A, B] et [C]
+        print(f"{'✅' if reseau.chemin(reseau.trouver_gare('G.UN'), reseau.trouver_gare('G.TROIS')) is None else '❌'} "
+              f"Pas de chemin entre composantes")
+        lignes = sorted(sorted(ligne['axes']) for ligne in reseau.lignes())
+        print(f"{'✅' if lignes == [['A', 'B'], ['C']] else '❌'} Lignes: {lignes}")
+        print(f"{'✅' if reseau.connexions_axes().get('A') == ['B'] else '❌'} Connexions: {reseau.connexions_axes()}")
+
+        # 4. Endpoints sur la base
+        from app import app, get_db_connection
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT code_gare FROM gpr.gpd_gares_ref WHERE code_gare IS NOT NULL AND geometrie IS NOT NULL
+            GROUP BY code_gare HAVING COUNT(*) = 1
+            ORDER BY MIN(id) LIMIT 2
+        """)
+        codes = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        conn.close()
+
+        client = app.test_client()
+        print(f"{'✅' if client.get('/api/network/path').status_code == 400 else '❌'} Paramètres manquants -> 400")
+        reponse = client.get('/api/network/path?from=INCONNUE&to=INCONNUE')
+        print(f"{'✅' if reponse.status_code == 404 else '❌'} Gare inconnue -> 404")
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT nomgarefr FROM gpr.gpd_gares_ref GROUP BY nomgarefr HAVING COUNT(*) > 1 LIMIT 1")
+        homonyme = cursor.fetchone()
+        cursor.close()
+        conn.close()
+        if homonyme:
+            reponse = client.get('/api/network/path', query_string={'from': homonyme[0], 'to': 'INCONNUE'})
+            candidats = reponse.get_json().get('candidats', [])
+            print(f"{'✅' if reponse.status_code == 400 and len(candidats) > 1 else '❌'} Nom ambigu '{homonyme[0]}' -> "
+                  f"HTTP {reponse.status_code}, {len(candidats)} candidates")
+        if len(codes) == 2:
+            reponse = client.get(f'/api/network/path?from={codes[0]}&to={codes[1]}')
+            data = reponse.get_json()
+            if reponse.status_code == 200:
+                print(f"✅ {codes[0]} -> {codes[1]}: {data['data']['distance_km']} km via "
+                      f"{[a['axe'] for a in data['data']['axes']]}")
+            else:
+                print(f"ℹ️  {codes[0]} -> {codes[1]}: {data.get('error')} (réseau non connexe)")
+
+        data = client.get('/api/arcs-multilines').get_json()
+        axes = [axe for ligne in data.get('lignes', []) for axe in ligne['axes']]
+        ok = len(axes) == data.get('total_axes') and all('position' in axe for axe in axes)
+        print(f"{'✅' if ok else '❌'} /api/arcs-multilines: {data.get('total_lignes')} lignes, "
+              f"{len(axes)}/{data.get('total_axes')} axes positionnés")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_reseau_ferre()
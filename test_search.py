@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test de la recherche mixte gares / axes / incidents (/api/search)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_search():
+    """Résultats classés, limite respectée, paramètres invalides refusés"""
+
+    try:
+        from app import app, get_db_connection, trigram_disponible, SEARCH_COLUMNS
+
+        print("🔍 Test de la recherche...")
+        print("=" * 50)
+
+        client = app.test_client()
+
+        # 1. Mode de recherche et index présents
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM pg_indexes WHERE schemaname = 'gpr' AND indexname LIKE '%_trgm'")
+        nb_index = cursor.fetchone()[0]
+        attendus = sum(len(colonnes) for colonnes in SEARCH_COLUMNS.values())
+        if trigram_disponible(cursor):
+            print(f"{'✅' if nb_index == attendus else '❌'} pg_trgm installé, {nb_index}/{attendus} index trigrammes")
+        else:
+            print("⚠️  pg_trgm absent : recherche ILIKE sans index (lancer python migrate_search_indexes.py)")
+
+        # 2. Une gare connue est retrouvée par son nom, en tête des résultats gare
+        cursor.execute("SELECT nomgarefr FROM gpr.gpd_gares_ref WHERE nomgarefr IS NOT NULL ORDER BY id LIMIT 1")
+        row = cursor.fetchone()
+        cursor.close()
+        conn.close()
+        if row:
+            nom = row[0]
+            response = client.get('/api/search', query_string={'q': nom, 'types': 'gare', 'limit': 5})
+            data = response.get_json().get('data', [])
+            ok = response.status_code == 200 and data and data[0]['label'] == nom
+            print(f"{'✅' if ok else '❌'} '{nom}': {len(data)} gare(s), score {data[0]['score'] if data else '-'}")
+
+        # 3. Résultats mixtes triés par score et limités
+        response = client.get('/api/search?q=train&limit=8')
+        result = response.get_json()
+        data = result.get('data', [])
+        scores = [r['score'] for r in data]
+        ok = len(data) <= 8 and scores == sorted(scores, reverse=True)
+        types = sorted({r['type'] for r in data})
+        print(f"{'✅' if ok else '❌'} 'train' ({result.get('mode')}): {len(data)} résultats {types}")
+
+        # 4. Paramètres invalides
+        for url in ['/api/search?q=a', '/api/search?q=casa&types=ville']:
+            response = client.get(url)
+            print(f"{'✅' if response.status_code == 400 else '❌'} {url} -> HTTP {response.status_code}")
+
+        # 5. Les jokers LIKE saisis sont cherchés littéralement
+        response = client.get('/api/search?q=%25%25%25')
+        print(f"{'✅' if response.get_json().get('data') == [] else '❌'} '%%%' ne correspond à rien")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_search()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test du calcul groupé des statistiques et de leur cache (compute_statistiques, stats_cache)
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_statistiques_cache():
+    """Comparer calcul direct et cache, puis vérifier l'invalidation"""
+
+    try:
+        from app import compute_statistiques, stats_cache, invalidate_caches
+
+        print("🔍 Test du cache des statistiques...")
+        print("=" * 50)
+
+        # 1. Calcul direct
+        start = time.perf_counter()
+        stats = compute_statistiques()
+        print(f"✅ Calcul complet en {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(f"   Gares: {stats['gares']['total']}, arcs: {stats['arcs']['total']}, "
+              f"événements: {stats['evenements']['total']} ({stats['evenements']['ouverts']} ouverts)")
+
+        # 2. Deuxième lecture servie par le cache
+        stats_cache.invalidate()
+        _, hit1 = stats_cache.get_or_compute(('', ''), compute_statistiques, tags=('evenements', 'gares'))
+        _, hit2 = stats_cache.get_or_compute(('', ''), compute_statistiques, tags=('evenements', 'gares'))
+        print(f"{'✅' if not hit1 and hit2 else '❌'} Premier appel calculé, second servi par le cache")
+
+        # 3. Une écriture sur les incidents invalide l'entrée
+        invalidate_caches('evenements')
+        _, hit3 = stats_cache.get_or_compute(('', ''), compute_statistiques, tags=('evenements', 'gares'))
+        print(f"{'✅' if not hit3 else '❌'} Entrée recalculée après invalidation 'evenements'")
+
+        # 4. Clés distinctes par combinaison de filtres
+        filtre = compute_statistiques(region='casa')
+        print(f"✅ Filtre region=casa: {filtre['gares']['total']} gares")
+
+        # 5. Entrées expirées purgées à l'insertion, nombre d'entrées borné (moins récemment utilisée évincée)
+        from app import TTLCache
+        cache = TTLCache('test_borne', ttl=0.05, max_entries=3)
+        cache.get_or_compute('a', lambda: 1)
+        time.sleep(0.06)
+        cache.get_or_compute('b', lambda: 2)
+        print(f"{'✅' if cache.stats()['entrees'] == 1 else '❌'} Entrée expirée purgée: {cache.stats()['entrees']} entrée(s)")
+        cache.ttl = 60
+        for cle in ('c', 'd'):
+            cache.get_or_compute(cle, lambda: 0)
+        cache.get_or_compute('b', lambda: 2)
+        cache.get_or_compute('e', lambda: 0)
+        _, hit_b = cache.get_or_compute('b', lambda: 2)
+        _, hit_c = cache.get_or_compute('c', lambda: 0)
+        ok = cache.stats()['entrees'] == 3 and hit_b and not hit_c and cache.stats()['evictions'] >= 1
+        print(f"{'✅' if ok else '❌'} Borne de 3 entrées: 'c' évincée, 'b' récemment lue conservée")
+        TTLCache.registry.remove(cache)
+
+        metriques = stats_cache.stats()
+        print(f"\n📊 Taux de hit: {metriques['hit_ratio']:.0%} ({metriques['hits']} hits / {metriques['misses']} misses)")
+        print(f"   Temps de calcul moyen: {metriques['calcul_ms']['moyenne']} ms (max {metriques['calcul_ms']['max']} ms)")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_statistiques_cache()
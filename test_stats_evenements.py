@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test des compteurs d'incidents pré-agrégés (gpr.stats_evenements)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_stats_evenements():
+    """Comparer les compteurs à un comptage direct, puis simuler une mise à jour incrémentale"""
+
+    try:
+        from app import get_db_connection, update_stats_evenements
+
+        print("🔍 Test des compteurs d'incidents...")
+        print("=" * 50)
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        # 1. Compteurs par état comparés à un GROUP BY sur la table des incidents
+        cursor.execute("SELECT COALESCE(etat, ''), COUNT(*) FROM gpr.ge_evenement GROUP BY 1")
+        direct = dict(cursor.fetchall())
+        cursor.execute("SELECT etat, n FROM gpr.stats_evenements WHERE dimension = 'total'")
+        compteurs = dict(cursor.fetchall())
+        if direct == compteurs:
+            print(f"✅ Compteurs par état cohérents ({sum(direct.values())} incidents)")
+        else:
+            print(f"❌ Compteurs incohérents: {compteurs} au lieu de {direct}")
+            print("   Lancer: python refresh_stats_evenements.py")
+
+        # 2. Retrait puis ajout d'un incident : les compteurs reviennent à l'identique
+        cursor.execute("SELECT id FROM gpr.ge_evenement ORDER BY id LIMIT 1")
+        row = cursor.fetchone()
+        if row:
+            cursor.execute("SELECT dimension, cle, etat, n FROM gpr.stats_evenements ORDER BY 1, 2, 3")
+            avant = cursor.fetchall()
+            update_stats_evenements(cursor, [row[0]], -1)
+            cursor.execute("SELECT SUM(n) FROM gpr.stats_evenements WHERE dimension = 'total'")
+            pendant = cursor.fetchone()[0]
+            update_stats_evenements(cursor, [row[0]], 1)
+            cursor.execute("SELECT dimension, cle, etat, n FROM gpr.stats_evenements ORDER BY 1, 2, 3")
+            apres = cursor.fetchall()
+            print(f"{'✅' if avant == apres else '❌'} Incident {row[0]} retiré ({pendant} incidents) puis réintégré")
+            conn.rollback()
+
+        # 3. Modifications simultanées du même incident : les compteurs restent exacts
+        cursor.execute("SELECT id, etat FROM gpr.ge_evenement ORDER BY id LIMIT 1")
+        row = cursor.fetchone()
+        conn.rollback()
+        if row:
+            import threading
+            from app import app
+
+            def modifier(etat):
+                app.test_client().put(f'/api/evenements/{row[0]}', json={'etat': etat})
+
+            threads = [threading.Thread(target=modifier, args=(etat,)) for etat in ['Ouvert', 'Clôturé'] * 4]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            cursor.execute("SELECT COALESCE(etat, ''), COUNT(*) FROM gpr.ge_evenement GROUP BY 1")
+            direct = dict(cursor.fetchall())
+            cursor.execute("SELECT etat, n FROM gpr.stats_evenements WHERE dimension = 'total'")
+            compteurs = dict(cursor.fetchall())
+            print(f"{'✅' if direct == compteurs else '❌'} {len(threads)} modifications simultanées de l'incident {row[0]}: "
+                  f"compteurs {'cohérents' if direct == compteurs else compteurs}")
+            modifier(row[1])
+            conn.rollback()
+
+        # 4. Répartition par dimension
+        cursor.execute("SELECT dimension, COUNT(*), SUM(n) FROM gpr.stats_evenements GROUP BY dimension ORDER BY dimension")
+        for dimension, groupes, total in cursor.fetchall():
+            print(f"   - {dimension:<8} {groupes:5} groupes, {total} incidents")
+
+        cursor.close()
+        conn.close()
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_stats_evenements()
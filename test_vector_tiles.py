@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test des tuiles vectorielles (/tiles/<couche>/<z>/<x>/<y>.mvt) et de leur invalidation
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import from app.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_vector_tiles():
+    """Tuiles des trois couches, cache disque et incrément de version sur écriture"""
+
+    try:
+        from app import app, get_db_connection, tile_cache_path, couche_version, TILE_LAYERS
+
+        print("🔍 Test des tuiles vectorielles...")
+        print("=" * 50)
+
+        client = app.test_client()
+
+        # 1. Tuile nationale (z=5) et tuile de Casablanca (z=12) pour chaque couche
+        for layer in TILE_LAYERS:
+            for z, x, y in [(5, 15, 12), (12, 1961, 1641)]:
+                response = client.get(f'/tiles/{layer}/{z}/{x}/{y}.mvt')
+                ok = response.status_code == 204 or layer.encode() in response.data
+                print(f"{'✅' if ok else '❌'} {layer:<10} {z}/{x}/{y}: HTTP {response.status_code}, "
+                      f"{len(response.data)} octets")
+
+        # 2. Cache disque sous la version courante
+        version = couche_version('gares')
+        if version is None:
+            print("⚠️  Table gpr.couches_versions absente : lancer python clear_tile_cache.py")
+        else:
+            chemin = tile_cache_path('gares', version, 5, 15, 12)
+            print(f"{'✅' if os.path.exists(chemin) else '❌'} Tuile cachée: {chemin}")
+
+            # 3. Une écriture sur la table incrémente la version (annulée ensuite)
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM gpr.couches_versions WHERE couche = 'gares'")
+            avant = cursor.fetchone()[0]
+            cursor.execute("UPDATE gpr.gpd_gares_ref SET etat = etat WHERE id = (SELECT MIN(id) FROM gpr.gpd_gares_ref)")
+            cursor.execute("SELECT version FROM gpr.couches_versions WHERE couche = 'gares'")
+            apres = cursor.fetchone()[0]
+            conn.rollback()
+            cursor.close()
+            conn.close()
+            print(f"{'✅' if apres == avant + 1 else '❌'} Version gares {avant} -> {apres} après écriture")
+
+        # 4. Paramètres invalides
+        codes = [client.get(url).status_code for url in ('/tiles/foo/1/0/0.mvt', '/tiles/gares/2/9/0.mvt')]
+        print(f"{'✅' if codes == [404, 404] else '❌'} Couche inconnue / tuile hors limites -> {codes}")
+
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+if __name__ == "__main__":
+    test_vector_tiles()
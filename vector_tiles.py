@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Encodage de tuiles vectorielles Mapbox (MVT 2.1) sans dépendance externe
+
+Utilisé par /tiles/<couche>/<z>/<x>/<y>.mvt quand PostGIS (ST_AsMVT) n'est pas disponible.
+Les géométries sont fournies en EPSG:3857 et converties en coordonnées entières de tuile.
+Définit aussi les conversions Web Mercator (EPSG:3857 <-> WGS84) utilisées par les autres modules.
+
+Spécification : https://github.com/mapbox/vector-tile-spec/tree/master/2.1
+"""
+
+import math
+import struct
+
+import numpy as np
+
+WEB_MERCATOR_RAYON = 6378137.0
+WEB_MERCATOR_ORIGINE = math.pi * WEB_MERCATOR_RAYON   # demi-largeur du monde en mètres
+
+# Types de géométrie MVT
+POINT = 1
+LINESTRING = 2
+
+# Commandes de géométrie
+MOVE_TO = 1
+LINE_TO = 2
+
+def tile_bounds(z, x, y):
+    """Emprise EPSG:3857 (x_min, y_min, x_max, y_max) de la tuile z/x/y (schéma XYZ, origine en haut à gauche)"""
+    taille = 2 * WEB_MERCATOR_ORIGINE / (2 ** z)
+    x_min = -WEB_MERCATOR_ORIGINE + x * taille
+    y_max = WEB_MERCATOR_ORIGINE - y * taille
+    return x_min, y_max - taille, x_min + taille, y_max
+
+def lonlat_to_mercator(lons, lats):
+    """Coordonnées WGS84 -> EPSG:3857 (formule sphérique, tableaux numpy)"""
+    lons = np.asarray(lons, dtype=float)
+    lats = np.clip(np.asarray(lats, dtype=float), -85.05112878, 85.05112878)
+    xs = np.radians(lons) * WEB_MERCATOR_RAYON
+    ys = np.log(np.tan(np.pi / 4 + np.radians(lats) / 2)) * WEB_MERCATOR_RAYON
+    return xs, ys
+
+def mercator_to_lonlat(xs, ys):
+    """Coordonnées EPSG:3857 -> WGS84 (formule sphérique, tableaux numpy)"""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    lons = np.degrees(xs / WEB_MERCATOR_RAYON)
+    lats = np.degrees(2 * np.arctan(np.exp(ys / WEB_MERCATOR_RAYON)) - np.pi / 2)
+    return lons, lats
+
+def to_tile_coords(xy, bounds, extent):
+    """Mètres EPSG:3857 (tableau (n, 2)) -> coordonnées entières de tuile, axe y vers le bas"""
+    x_min, _, x_max, y_max = bounds
+    echelle = extent / (x_max - x_min)
+    px = np.rint((xy[:, 0] - x_min) * echelle)
+    py = np.rint((y_max - xy[:, 1]) * echelle)
+    return np.column_stack((px, py)).astype(np.int64)
+
+def clip_linestring(xy, bounds):
+    """Portions d'une ligne dont les segments touchent l'emprise : liste de tableaux (n, 2)
+
+    Découpage conservatif par boîte englobante de segment : les segments qui traversent
+    l'emprise sont gardés entiers, le renderer rogne au bord de la tuile.
+    """
+    if len(xy) < 2:
+        return []
+    x_min, y_min, x_max, y_max = bounds
+    debut, fin = xy[:-1], xy[1:]
+    gardes = ((np.minimum(debut[:, 0], fin[:, 0]) <= x_max) & (np.maximum(debut[:, 0], fin[:, 0]) >= x_min) &
+              (np.minimum(debut[:, 1], fin[:, 1]) <= y_max) & (np.maximum(debut[:, 1], fin[:, 1]) >= y_min))
+    if not gardes.any():
+        return []
+    if gardes.all():
+        return [xy]
+    # Suites de segments gardés consécutifs -> une partie de ligne chacune
+    bords = np.diff(np.concatenate(([0], gardes.astype(np.int8), [0])))
+    return [xy[a:b + 1] for a, b in zip(np.flatnonzero(bords == 1), np.flatnonzero(bords == -1))]
+
+def _varint(n):
+    """Entier non signé en varint protobuf"""
+    out = bytearray()
+    while True:
+        octet = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(octet | 0x80)
+        else:
+            out.append(octet)
+            return bytes(out)
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+def _field_varint(champ, n):
+    return _varint(champ << 3) + _varint(n)
+
+def _field_bytes(champ, data):
+    return _varint((champ << 3) | 2) + _varint(len(data)) + data
+
+def _packed(champ, valeurs):
+    return _field_bytes(champ, b''.join(_varint(v) for v in valeurs))
+
+def _encode_value(valeur):
+    """Message Value : chaîne, booléen, entier ou flottant"""
+    if isinstance(valeur, bool):
+        return _field_varint(7, int(valeur))
+    if isinstance(valeur, int):
+        if valeur < 0:
+            return _field_varint(6, _zigzag(valeur))
+        return _field_varint(5, valeur)
+    if isinstance(valeur, float):
+        return _varint((3 << 3) | 1) + struct.pack('<d', valeur)
+    return _field_bytes(1, str(valeur).encode('utf-8'))
+
+def encode_geometry(geom_type, parts):
+    """Commandes MVT d'une géométrie (parts : tableaux (n, 2) d'entiers en coordonnées de tuile)
+
+    Points : un MoveTo groupé pour toutes les positions. Lignes : MoveTo + LineTo par
+    partie, sommets consécutifs identiques supprimés, parties dégénérées ignorées.
+    """
+    commandes = []
+    cx = cy = 0
+    if geom_type == POINT:
+        points = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        commandes.append(MOVE_TO | (len(points) << 3))
+        for px, py in points.tolist():
+            commandes.extend((_zigzag(px - cx), _zigzag(py - cy)))
+            cx, cy = px, py
+        return commandes
+
+    for part in parts:
+        if len(part) > 1:
+            distincts = np.concatenate(([True], np.any(part[1:] != part[:-1], axis=1)))
+            part = part[distincts]
+        if len(part) < 2:
+            continue
+        sommets = part.tolist()
+        px, py = sommets[0]
+        commandes.extend((MOVE_TO | (1 << 3), _zigzag(px - cx), _zigzag(py - cy)))
+        cx, cy = px, py
+        commandes.append(LINE_TO | ((len(sommets) - 1) << 3))
+        for px, py in sommets[1:]:
+            commandes.extend((_zigzag(px - cx), _zigzag(py - cy)))
+            cx, cy = px, py
+    return commandes
+
+def encode_layer(nom, features, extent=4096):
+    """Message Layer ; features : liste de (id, type, parts, propriétés)"""
+    cles, valeurs = {}, {}
+    corps = []
+    for feature_id, geom_type, parts, proprietes in features:
+        geometrie = encode_geometry(geom_type, parts) if parts else []
+        if not geometrie:
+            continue
+        tags = []
+        for cle, valeur in proprietes.items():
+            if valeur is None:
+                continue
+            tags.append(cles.setdefault(cle, len(cles)))
+            tags.append(valeurs.setdefault((type(valeur), valeur), len(valeurs)))
+        message = b''
+        if feature_id is not None:
+            message += _field_varint(1, int(feature_id))
+        if tags:
+            message += _packed(2, tags)
+        message += _field_varint(3, geom_type) + _packed(4, geometrie)
+        corps.append(_field_bytes(2, message))
+
+    if not corps:
+        return b''
+    layer = _field_varint(15, 2) + _field_bytes(1, nom.encode('utf-8'))
+    layer += b''.join(corps)
+    layer += b''.join(_field_bytes(3, cle.encode('utf-8')) for cle in cles)
+    layer += b''.join(_field_bytes(4, _encode_value(valeur)) for _, valeur in valeurs)
+    layer += _field_varint(5, extent)
+    return _field_bytes(3, layer)